@@ -1,11 +1,196 @@
 import pyautogui
 import numpy as np
 import time
-from pykalman import KalmanFilter
+
+try:
+    import Quartz  # macOS only
+except ImportError:
+    Quartz = None
+
+try:
+    from numba import njit
+except ImportError:  # Run the gesture kernels as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+MIN_MOVEMENT = 2  # Cursor deadband in pixels (Manhattan distance)
+
+# Fingertips (index, middle, ring, pinky) measured against the wrist
+CURL_IDX = np.array([8, 12, 16, 20], dtype=np.intp)
+
+
+class _MouseBackend:
+    """Thin mouse output layer.
+
+    On macOS events are posted straight to Quartz, skipping pyautogui's
+    argument handling, failsafe checks and cursor position readback. Other
+    platforms go through pyautogui.
+    """
+    def __init__(self):
+        self.quartz = Quartz is not None
+        self.pressed = False
+        if self.quartz:
+            self.pos = tuple(Quartz.CGEventGetLocation(Quartz.CGEventCreate(None)))
+            # Reused for every move; only the location changes
+            self._move_ev = Quartz.CGEventCreateMouseEvent(
+                None, Quartz.kCGEventMouseMoved, self.pos, Quartz.kCGMouseButtonLeft)
+            self._drag_ev = Quartz.CGEventCreateMouseEvent(
+                None, Quartz.kCGEventLeftMouseDragged, self.pos, Quartz.kCGMouseButtonLeft)
+
+    def _post_button(self, event_type, button):
+        ev = Quartz.CGEventCreateMouseEvent(None, event_type, self.pos, button)
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+    def move(self, x, y):
+        if not self.quartz:
+            pyautogui.moveTo(x, y, _pause=False)
+            return
+        self.pos = (x, y)
+        ev = self._drag_ev if self.pressed else self._move_ev
+        Quartz.CGEventSetLocation(ev, self.pos)
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+    def mouse_down(self):
+        self.pressed = True
+        if not self.quartz:
+            pyautogui.mouseDown(_pause=False)
+            return
+        self._post_button(Quartz.kCGEventLeftMouseDown, Quartz.kCGMouseButtonLeft)
+
+    def mouse_up(self):
+        self.pressed = False
+        if not self.quartz:
+            pyautogui.mouseUp(_pause=False)
+            return
+        self._post_button(Quartz.kCGEventLeftMouseUp, Quartz.kCGMouseButtonLeft)
+
+    def click(self):
+        if not self.quartz:
+            pyautogui.click(_pause=False)
+            return
+        self._post_button(Quartz.kCGEventLeftMouseDown, Quartz.kCGMouseButtonLeft)
+        self._post_button(Quartz.kCGEventLeftMouseUp, Quartz.kCGMouseButtonLeft)
+
+    def right_click(self):
+        if not self.quartz:
+            pyautogui.rightClick(_pause=False)
+            return
+        self._post_button(Quartz.kCGEventRightMouseDown, Quartz.kCGMouseButtonRight)
+        self._post_button(Quartz.kCGEventRightMouseUp, Quartz.kCGMouseButtonRight)
+
+    def scroll(self, dy):
+        if not self.quartz:
+            pyautogui.scroll(dy, _pause=False)
+            return
+        ev = Quartz.CGEventCreateScrollWheelEvent(None, Quartz.kCGScrollEventUnitLine, 1, dy)
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+
+# Order of the flags returned by _gesture_core
+GESTURES = ('click', 'drag', 'enter', 'dictation', 'scroll_up', 'scroll_down', 'right_click')
+
+
+@njit(cache=True, fastmath=True)
+def _gesture_core(L, now, dragging, state, params):
+    """Classify gestures from a (21, 2) landmark array.
+
+    state holds [last_click, last_drag, last_enter, last_dictation,
+    dictation_start] (dictation_start < 0 means not started) and is updated
+    in place. params holds the squared distance thresholds, cooldowns and
+    dictation hold time. Returns one flag per entry of GESTURES.
+    """
+    (pinch_sq, enter_sq, finger_out_sq, dictation_curl_sq,
+     click_cd, drag_cd, enter_cd, dictation_cd, dictation_hold) = params
+    g = np.zeros(7, dtype=np.bool_)
+
+    # Click gesture (pinch)
+    dx = L[4, 0] - L[8, 0]
+    dy = L[4, 1] - L[8, 1]
+    pinch = dx * dx + dy * dy < pinch_sq
+    if pinch and now - state[0] > click_cd:
+        g[0] = True
+        state[0] = now
+
+    # Drag gesture (hold pinch)
+    if pinch and not dragging and now - state[1] > drag_cd:
+        g[1] = True
+        state[1] = now
+
+    # Squared fingertip-to-wrist distances, shared by the fist and dictation checks
+    fingers_curled = True
+    rest_curled = True
+    for i in range(4):
+        tip = CURL_IDX[i]
+        dx = L[tip, 0] - L[0, 0]
+        dy = L[tip, 1] - L[0, 1]
+        d_sq = dx * dx + dy * dy
+        if d_sq >= enter_sq:
+            fingers_curled = False
+        if i < 3 and d_sq >= dictation_curl_sq:
+            rest_curled = False
+
+    # Enter gesture (fist)
+    palm_facing = L[0, 1] < L[9, 1]
+    if fingers_curled and palm_facing and now - state[2] > enter_cd:
+        g[2] = True
+        state[2] = now
+
+    # Dictation gesture (thumb and pinky out, rest curled)
+    dx = L[4, 0] - L[2, 0]
+    dy = L[4, 1] - L[2, 1]
+    thumb_out = dx * dx + dy * dy > finger_out_sq
+    dx = L[20, 0] - L[18, 0]
+    dy = L[20, 1] - L[18, 1]
+    pinky_out = dx * dx + dy * dy > finger_out_sq
+    if thumb_out and pinky_out and rest_curled:
+        if state[4] < 0:
+            state[4] = now
+        elif now - state[4] > dictation_hold and now - state[3] > dictation_cd:
+            g[3] = True
+            state[3] = now
+            state[4] = -1.0
+    else:
+        state[4] = -1.0
+
+    # Scroll gestures (index and middle finger pointing up/down)
+    index_up = L[8, 1] < L[6, 1]
+    middle_up = L[12, 1] < L[10, 1]
+    if index_up and middle_up:
+        if L[8, 1] < L[12, 1]:
+            g[4] = True
+        else:
+            g[5] = True
+
+    # Right click gesture (ring and pinky finger pointing up)
+    ring_up = L[16, 1] < L[14, 1]
+    pinky_up = L[20, 1] < L[18, 1]
+    if ring_up and pinky_up and not index_up and not middle_up:
+        g[6] = True
+
+    return g
+
+
+@njit(cache=True, fastmath=True)
+def _velocity_smoothing_core(x, y, dx, dy, prev_x, prev_y, has_prev, velocity_threshold):
+    """Blend (x, y) towards the previous position, harder when moving slowly"""
+    if dx * dx + dy * dy > velocity_threshold * velocity_threshold:
+        # If velocity is high, reduce the movement
+        smoothing = 0.7
+    else:
+        # Normal smoothing for low velocity
+        smoothing = 0.9
+    if has_prev:
+        x = prev_x * smoothing + x * (1 - smoothing)
+        y = prev_y * smoothing + y * (1 - smoothing)
+    return x, y
+
 
 class HandController:
     def __init__(self):
         self.screen_w, self.screen_h = pyautogui.size()
+        self.mouse = _MouseBackend()
         self.prev_x = None
         self.prev_y = None
         self.smooth_factor = 0.9
@@ -13,158 +198,120 @@ class HandController:
         self.drag_cooldown = 0.2
         self.enter_cooldown = 1.0
         self.dictation_cooldown = 2.0
-        self.last_click = 0
-        self.last_drag = 0
-        self.last_enter = 0
-        self.last_dictation = 0
         self.dragging = False
         self.bottom_screen_triggered = False
         self.dynamic_min_y = 1.0
         self.dynamic_max_y = 0.0
         self.pinch_threshold = 0.04
         self.enter_threshold = 0.08
+        self.finger_out_threshold = 0.08
+        self.dictation_curl_threshold = 0.07
         self.dictation_hold_time = 1.0
-        self.dictation_start = None
+        # Parameters and timing state for _gesture_core; the gesture checks
+        # compare squared distances against squared thresholds
+        self._gesture_params = (
+            self.pinch_threshold ** 2,
+            self.enter_threshold ** 2,
+            self.finger_out_threshold ** 2,
+            self.dictation_curl_threshold ** 2,
+            self.click_cooldown,
+            self.drag_cooldown,
+            self.enter_cooldown,
+            self.dictation_cooldown,
+            self.dictation_hold_time,
+        )
+        # [last_click, last_drag, last_enter, last_dictation, dictation_start]
+        self._gesture_state = np.array([0.0, 0.0, 0.0, 0.0, -1.0])
         self.hand_detected = False
         self.hand_detection_timeout = 0.3  # Reduced timeout for faster response
         self.last_hand_detection = 0
         self.bounds_margin = 0.1  # Margin for bounds checking
         self.velocity_threshold = 0.5  # Threshold for velocity-based smoothing
+        self._last_screen_xy = (None, None)  # Last position sent to the OS
         
-        # Initialize Kalman filter with more aggressive smoothing
-        self.kf = KalmanFilter(
-            initial_state_mean=[0, 0, 0, 0],  # [x, y, dx, dy]
-            n_dim_obs=2,  # We only observe x and y
-            n_dim_state=4,  # State includes position and velocity
-            transition_matrices=np.array([
-                [1, 0, 1, 0],
-                [0, 1, 0, 1],
-                [0, 0, 0.8, 0],  # Reduced velocity persistence
-                [0, 0, 0, 0.8]
-            ]),
-            observation_matrices=np.array([
-                [1, 0, 0, 0],
-                [0, 1, 0, 0]
-            ]),
-            transition_covariance=0.005 * np.eye(4),  # Reduced process noise
-            observation_covariance=0.05 * np.eye(2),  # Reduced measurement noise
-            initial_state_covariance=np.eye(4)
-        )
-        self.kf_state = None
-        self.kf_covariance = None
-        self.last_positions = []  # Store last N positions for velocity calculation
+        # Constant-velocity Kalman model with more aggressive smoothing.
+        # State is [x, y, dx, dy]; we only observe x and y.
+        self.kf_F = np.array([
+            [1, 0, 1, 0],
+            [0, 1, 0, 1],
+            [0, 0, 0.8, 0],  # Reduced velocity persistence
+            [0, 0, 0, 0.8]
+        ])
+        self.kf_Q = 0.005 * np.eye(4)  # Reduced process noise
+        self.kf_R = 0.05 * np.eye(2)  # Reduced measurement noise
+        self.kf_state = np.zeros(4)
+        self.kf_covariance = np.eye(4)
         self.max_position_history = 5
+        # Ring buffer of the last N positions for velocity calculation
+        self._pos_buf = np.zeros((self.max_position_history, 2), np.float32)
+        self._pos_idx = 0  # Next slot to write
+        self._pos_n = 0  # Number of valid entries
 
-    def _is_hand_detected(self, landmarks):
-        if landmarks is None or len(landmarks) < 21:
+    def _is_hand_detected(self, L):
+        if L is None or len(L) < 21:
             return False
         
-        # Check if hand landmarks are within reasonable bounds with margin
-        x_coords = [x for x, _ in landmarks]
-        y_coords = [y for _, y in landmarks]
-        
         # Check if any landmark is outside the bounds (with margin)
-        if (min(x_coords) < -self.bounds_margin or max(x_coords) > 1 + self.bounds_margin or
-            min(y_coords) < -self.bounds_margin or max(y_coords) > 1 + self.bounds_margin):
+        if (L.min(0) < -self.bounds_margin).any() or (L.max(0) > 1 + self.bounds_margin).any():
             return False
             
         return True
 
     def _calculate_velocity(self, x, y):
         """Calculate velocity based on recent positions"""
-        self.last_positions.append((x, y))
-        if len(self.last_positions) > self.max_position_history:
-            self.last_positions.pop(0)
+        buf = self._pos_buf
+        N = self.max_position_history
+        idx = self._pos_idx
+        n = min(self._pos_n + 1, N)
+        buf[idx] = (x, y)
+        self._pos_idx = (idx + 1) % N
+        self._pos_n = n
         
-        if len(self.last_positions) < 2:
+        if n < 2:
             return 0, 0
             
-        dx = (self.last_positions[-1][0] - self.last_positions[0][0]) / len(self.last_positions)
-        dy = (self.last_positions[-1][1] - self.last_positions[0][1]) / len(self.last_positions)
+        # The newest entry is the (x, y) just written
+        first = buf[(idx + 1 - n) % N]
+        inv_n = 1.0 / n
+        dx = (x - first[0]) * inv_n
+        dy = (y - first[1]) * inv_n
         return dx, dy
 
     def _apply_velocity_smoothing(self, x, y, dx, dy):
         """Apply additional smoothing based on velocity"""
-        velocity = np.sqrt(dx*dx + dy*dy)
-        if velocity > self.velocity_threshold:
-            # If velocity is high, reduce the movement
-            smoothing = 0.7
-        else:
-            # Normal smoothing for low velocity
-            smoothing = 0.9
-            
-        if self.prev_x is not None and self.prev_y is not None:
-            x = self.prev_x * smoothing + x * (1 - smoothing)
-            y = self.prev_y * smoothing + y * (1 - smoothing)
-            
+        has_prev = self.prev_x is not None and self.prev_y is not None
+        x, y = _velocity_smoothing_core(
+            x, y, dx, dy,
+            self.prev_x if has_prev else 0.0, self.prev_y if has_prev else 0.0,
+            has_prev, self.velocity_threshold)
         self.prev_x, self.prev_y = x, y
         return x, y
 
-    def _detect_gestures(self, landmarks, now):
-        gestures = {
-            'click': False,
-            'drag': False,
-            'enter': False,
-            'dictation': False,
-            'scroll_up': False,
-            'scroll_down': False,
-            'right_click': False
-        }
-        
-        # Click gesture (pinch)
-        pinch = np.linalg.norm(np.array(landmarks[4]) - np.array(landmarks[8])) < self.pinch_threshold
-        if pinch and now - self.last_click > self.click_cooldown:
-            gestures['click'] = True
-            self.last_click = now
-
-        # Drag gesture (hold pinch)
-        if pinch and not self.dragging and now - self.last_drag > self.drag_cooldown:
-            gestures['drag'] = True
-            self.last_drag = now
-
-        # Enter gesture (fist)
-        fingers_curled = all(np.linalg.norm(np.array(landmarks[i]) - np.array(landmarks[0])) < self.enter_threshold 
-                           for i in [8,12,16,20])
-        palm_facing = landmarks[0][1] < landmarks[9][1]
-        if fingers_curled and palm_facing and now - self.last_enter > self.enter_cooldown:
-            gestures['enter'] = True
-            self.last_enter = now
-
-        # Dictation gesture (thumb and pinky out, rest curled)
-        thumb_out = np.linalg.norm(np.array(landmarks[4]) - np.array(landmarks[2])) > 0.08
-        pinky_out = np.linalg.norm(np.array(landmarks[20]) - np.array(landmarks[18])) > 0.08
-        rest_curled = all(np.linalg.norm(np.array(landmarks[i]) - np.array(landmarks[0])) < 0.07 
-                         for i in [8,12,16])
-        if thumb_out and pinky_out and rest_curled:
-            if self.dictation_start is None:
-                self.dictation_start = now
-            elif now - self.dictation_start > self.dictation_hold_time and now - self.last_dictation > self.dictation_cooldown:
-                gestures['dictation'] = True
-                self.last_dictation = now
-                self.dictation_start = None
-        else:
-            self.dictation_start = None
-
-        # Scroll gestures (index and middle finger pointing up/down)
-        index_up = landmarks[8][1] < landmarks[6][1]
-        middle_up = landmarks[12][1] < landmarks[10][1]
-        if index_up and middle_up:
-            if landmarks[8][1] < landmarks[12][1]:
-                gestures['scroll_up'] = True
-            else:
-                gestures['scroll_down'] = True
-
-        # Right click gesture (ring and pinky finger pointing up)
-        ring_up = landmarks[16][1] < landmarks[14][1]
-        pinky_up = landmarks[20][1] < landmarks[18][1]
-        if ring_up and pinky_up and not index_up and not middle_up:
-            gestures['right_click'] = True
+    def _kalman_update(self, x, y):
+        """One predict/update step of the constant-velocity Kalman filter"""
+        F = self.kf_F
+        state = F @ self.kf_state
+        P = F @ self.kf_covariance @ F.T + self.kf_Q
 
-        return gestures
+        # The observation matrix just picks out [x, y], so H @ P @ H.T is the
+        # top-left 2x2 block of P and the 2x2 inverse can be done in closed form
+        S = P[:2, :2] + self.kf_R
+        a, b, c, d = S[0, 0], S[0, 1], S[1, 0], S[1, 1]
+        S_inv = np.array([[d, -b], [-c, a]]) / (a * d - b * c)
+        K = P[:, :2] @ S_inv
+
+        self.kf_state = state + K @ np.array([x - state[0], y - state[1]])
+        self.kf_covariance = P - K @ P[:2, :]
+
+    def _detect_gestures(self, L, now):
+        flags = _gesture_core(L, now, self.dragging, self._gesture_state, self._gesture_params)
+        return dict(zip(GESTURES, flags))
 
     def update(self, landmarks):
         now = time.time()
-        hand_detected = self._is_hand_detected(landmarks)
+        # Pack the 21 landmarks once per frame for the bounds and gesture math
+        L = None if landmarks is None else np.asarray(landmarks, dtype=np.float32)
+        hand_detected = self._is_hand_detected(L)
         
         # Update hand detection state
         if hand_detected:
@@ -173,10 +320,10 @@ class HandController:
         elif now - self.last_hand_detection > self.hand_detection_timeout:
             self.hand_detected = False
             if self.dragging:
-                pyautogui.mouseUp()
+                self.mouse.mouse_up()
                 self.dragging = False
             # Clear position history when hand is lost
-            self.last_positions.clear()
+            self._pos_n = 0
             return
 
         if not self.hand_detected:
@@ -194,16 +341,7 @@ class HandController:
         dx, dy = self._calculate_velocity(x, mapped_y)
 
         # Apply Kalman filter
-        if self.kf_state is None:
-            self.kf_state = self.kf.initial_state_mean
-            self.kf_covariance = self.kf.initial_state_covariance
-        
-        measurement = np.array([x, mapped_y])
-        self.kf_state, self.kf_covariance = self.kf.filter_update(
-            filtered_state_mean=self.kf_state,
-            filtered_state_covariance=self.kf_covariance,
-            observation=measurement
-        )
+        self._kalman_update(x, mapped_y)
         
         smoothed_x, smoothed_y = self.kf_state[0], self.kf_state[1]
         
@@ -213,31 +351,34 @@ class HandController:
         screen_x = int(smoothed_x * self.screen_w)
         screen_y = int(smoothed_y * self.screen_h)
         
-        # Move cursor
-        pyautogui.moveTo(screen_x, screen_y)
+        # Move cursor, skipping sub-deadband jitter
+        last_x, last_y = self._last_screen_xy
+        if last_x is None or abs(screen_x - last_x) + abs(screen_y - last_y) >= MIN_MOVEMENT:
+            self.mouse.move(screen_x, screen_y)
+            self._last_screen_xy = (screen_x, screen_y)
 
         # Process gestures
-        gestures = self._detect_gestures(landmarks, now)
+        gestures = self._detect_gestures(L, now)
         
         # Execute gestures
         if gestures['click']:
-            pyautogui.click()
+            self.mouse.click()
         if gestures['drag']:
-            pyautogui.mouseDown()
+            self.mouse.mouse_down()
             self.dragging = True
         elif not gestures['drag'] and self.dragging:
-            pyautogui.mouseUp()
+            self.mouse.mouse_up()
             self.dragging = False
         if gestures['enter']:
             pyautogui.press('enter')
         if gestures['dictation']:
             print("Dictation gesture triggered!")
         if gestures['scroll_up']:
-            pyautogui.scroll(10)
+            self.mouse.scroll(10)
         if gestures['scroll_down']:
-            pyautogui.scroll(-10)
+            self.mouse.scroll(-10)
         if gestures['right_click']:
-            pyautogui.rightClick()
+            self.mouse.right_click()
 
         # Bottom screen gesture
         if mapped_y > 0.95 and not self.bottom_screen_triggered:
@@ -246,7 +387,9 @@ class HandController:
         elif mapped_y <= 0.95:
             self.bottom_screen_triggered = False
 
+        return gestures
+
     def close(self):
         if self.dragging:
-            pyautogui.mouseUp()
+            self.mouse.mouse_up()
             self.dragging = False 
\ No newline at end of file
@@ -1,23 +1,99 @@
 import cv2
 import mediapipe as mp
+import numpy as np
+import os
+import threading
 import time
 
+try:
+    from mediapipe.tasks.python import BaseOptions, vision
+except ImportError:
+    vision = None
+
+# Optional MediaPipe Tasks models, in order of preference. An int8-quantized
+# bundle runs on the CPU (XNNPACK int8 kernels); the float one on the GPU delegate
+_RESOURCES = os.path.join(os.path.dirname(__file__), 'resources')
+HAND_MODEL_INT8_PATH = os.path.join(_RESOURCES, 'hand_landmarker_int8.task')
+HAND_MODEL_PATH = os.path.join(_RESOURCES, 'hand_landmarker.task')
+
 class HandTracker:
     def __init__(self):
         self.cap = None
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5,
-            model_complexity=1
-        )
+        self.hands = None
+        self.crop_hands = None
+        self._timestamp_ms = 0  # Strictly increasing timestamps for the Tasks landmarker
+        self.landmarker = self._create_landmarker(video=True)
+        # ROI crops are run through their own single-image graph: feeding
+        # them to the tracking graph would mix crop and full-frame
+        # coordinates in its frame-to-frame state
+        self.crop_landmarker = self._create_landmarker(video=False)
+        if self.landmarker is None:
+            self.mp_hands = mp.solutions.hands
+            self.hands = self._create_hands(static_image_mode=False)
+        if self.crop_landmarker is None:
+            self.mp_hands = mp.solutions.hands
+            self.crop_hands = self._create_hands(static_image_mode=True)
+        # Run one blank frame through the graph so model loading and
+        # interpreter setup don't stall the first real frame
+        self._process(np.zeros((240, 320, 3), dtype=np.uint8))
         self.frame = None
         self.last_landmarks = None
-        self.last_frame_time = 0
-        self.frame_interval = 1.0 / 30  # Target 30 FPS
+        self.roi = None  # (x0, y0, x1, y1) pixel box around the last tracked hand
+        self.roi_padding = 0.3  # Grow the landmark box by 30% on each side
+        self.roi_min_confidence = 0.8  # Below this, re-run on the full frame
+        self.frame_timeout = 1.0 / 30  # Max wait for a new frame in next_frame
+        # Static-scene detection on a tiny grayscale copy of each frame
+        self.motion_threshold = 2.0  # Mean absolute luma change that counts as motion
+        self.static_frames_before_skip = 3  # Still frames before inference is skipped
+        self._prev_luma = None
+        self._static_frames = 0
+        # When inference overruns its frame budget, still frames are skipped
+        # right away (not after static_frames_before_skip) for that long
+        self.inference_budget = 1.0 / 30
+        self._skip_until = 0.0
+        # Latest captured frame, handed over from the capture thread
+        self._frame_cond = threading.Condition()
+        self._latest = None
+        self._rgb_buf = None  # Reused BGR->RGB output buffer
+        self._latest_id = 0
+        self._seen_id = 0
+        self._running = True
         self.initialize_camera()
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+
+    def _create_hands(self, static_image_mode):
+        """CPU MediaPipe Hands solution, tracking across frames unless static_image_mode"""
+        return self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=1,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.5,
+            model_complexity=0  # Lite landmark model, accurate enough for cursor control
+        )
+
+    def _create_landmarker(self, video):
+        """Tasks hand landmarker for a bundled model, or None to stay on the CPU solution"""
+        if vision is None:
+            return None
+        if os.path.exists(HAND_MODEL_INT8_PATH):
+            model_path, delegate = HAND_MODEL_INT8_PATH, BaseOptions.Delegate.CPU
+        elif os.path.exists(HAND_MODEL_PATH):
+            model_path, delegate = HAND_MODEL_PATH, BaseOptions.Delegate.GPU
+        else:
+            return None
+        try:
+            options = vision.HandLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+                running_mode=vision.RunningMode.VIDEO if video else vision.RunningMode.IMAGE,
+                num_hands=1,
+                min_hand_detection_confidence=0.6,
+                min_tracking_confidence=0.5
+            )
+            return vision.HandLandmarker.create_from_options(options)
+        except Exception as e:
+            print(f"Hand landmarker model {model_path} unavailable, using default: {e}")
+            return None
 
     def initialize_camera(self):
         """Initialize the camera with retries"""
@@ -26,10 +102,12 @@ class HandTracker:
             try:
                 self.cap = cv2.VideoCapture(0)
                 if self.cap.isOpened():
-                    # Set camera properties for better performance
-                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                    self.cap.set(cv2.CAP_PROP_FPS, 30)
+                    # Set camera properties for better performance. MediaPipe
+                    # resizes to its own small model input anyway, so a low
+                    # capture resolution loses no landmark accuracy
+                    self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
+                    self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+                    self.cap.set(cv2.CAP_PROP_FPS, 60)
                     return True
             except Exception as e:
                 print(f"Camera initialization attempt {i+1} failed: {e}")
@@ -38,44 +116,160 @@ class HandTracker:
                 time.sleep(1)
         return False
 
-    def next_frame(self):
-        """Get the next frame with timing control"""
-        current_time = time.time()
-        if current_time - self.last_frame_time < self.frame_interval:
-            return self.frame
+    def _capture_loop(self):
+        """Keep draining the camera so only the newest frame is ever kept"""
+        while self._running:
+            if self.cap is None or not self.cap.isOpened():
+                if not self.initialize_camera():
+                    time.sleep(1)
+                    continue
 
-        if self.cap is None or not self.cap.isOpened():
-            if not self.initialize_camera():
-                return None
+            ret, frame = self.cap.read()
+            if not ret:
+                print("Failed to read frame from camera")
+                time.sleep(0.01)
+                continue
 
-        ret, frame = self.cap.read()
-        if not ret:
-            print("Failed to read frame from camera")
-            return None
+            with self._frame_cond:
+                self._latest = frame
+                self._latest_id += 1
+                self._frame_cond.notify_all()
+
+    def next_raw_frame(self):
+        """Wait for the next captured BGR frame, or return None if none arrives in time.
+
+        Each captured frame is a new array the capture thread never touches
+        again, so it can be handed to another thread without copying.
+        """
+        with self._frame_cond:
+            if not self._frame_cond.wait_for(lambda: self._latest_id != self._seen_id,
+                                             timeout=self.frame_timeout):
+                return None
+            self._seen_id = self._latest_id
+            return self._latest
 
-        self.frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.last_frame_time = current_time
+    def to_rgb(self, frame):
+        """Convert a captured frame into the reused RGB buffer and return it"""
+        # Only frames that are actually consumed get converted, into the
+        # same output buffer every time instead of a fresh allocation
+        self._rgb_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        self.frame = self._rgb_buf
         return self.frame
 
+    def next_frame(self):
+        """Wait for the next captured frame as RGB, or return None if none arrives in time"""
+        frame = self.next_raw_frame()
+        return None if frame is None else self.to_rgb(frame)
+
+    def _process(self, frame, crop=False):
+        """Run MediaPipe and return normalized landmarks with their confidence.
+
+        Full frames go through the tracking graph, crops through the
+        single-image one.
+        """
+        landmarker = self.crop_landmarker if crop else self.landmarker
+        if landmarker is not None:
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+            if crop:
+                result = landmarker.detect(image)
+            else:
+                self._timestamp_ms = max(self._timestamp_ms + 1, int(time.monotonic() * 1000))
+                result = landmarker.detect_for_video(image, self._timestamp_ms)
+            if not result.hand_landmarks:
+                return None, 0.0
+            score = result.handedness[0][0].score
+            return [(lm.x, lm.y) for lm in result.hand_landmarks[0]], score
+
+        results = (self.crop_hands if crop else self.hands).process(frame)
+        if not results.multi_hand_landmarks:
+            return None, 0.0
+        hand_landmarks = results.multi_hand_landmarks[0]
+        score = results.multi_handedness[0].classification[0].score
+        return [(lm.x, lm.y) for lm in hand_landmarks.landmark], score
+
+    def _update_roi(self, landmarks, w, h):
+        """Cache a padded pixel box around the landmarks for the next frame"""
+        xs = [x for x, _ in landmarks]
+        ys = [y for _, y in landmarks]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+        pad_x = (max_x - min_x) * self.roi_padding
+        pad_y = (max_y - min_y) * self.roi_padding
+        x0 = max(0, int((min_x - pad_x) * w))
+        y0 = max(0, int((min_y - pad_y) * h))
+        x1 = min(w, int((max_x + pad_x) * w))
+        y1 = min(h, int((max_y + pad_y) * h))
+        self.roi = (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+
+    def _can_skip_inference(self, frame):
+        """True when the frame has barely changed and the last result can be reused"""
+        small = cv2.resize(frame, (80, 60), interpolation=cv2.INTER_AREA)
+        luma = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        if self._prev_luma is not None and cv2.absdiff(luma, self._prev_luma).mean() < self.motion_threshold:
+            self._static_frames += 1
+        else:
+            self._static_frames = 0
+        self._prev_luma = luma
+        if self._static_frames >= self.static_frames_before_skip:
+            return True
+        # Inference is lagging: don't wait for several still frames
+        return self._static_frames > 0 and time.monotonic() < self._skip_until
+
     def get_landmarks(self, frame):
         """Get hand landmarks with error handling"""
         if frame is None:
             return None
 
         try:
-            results = self.hands.process(frame)
-            if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                landmarks = [(lm.x, lm.y) for lm in hand_landmarks.landmark]
+            # Nothing moved: reuse the last result instead of running MediaPipe
+            if self._can_skip_inference(frame):
+                return self.last_landmarks
+
+            t0 = time.monotonic()
+            h, w = frame.shape[:2]
+            landmarks = None
+
+            # Try the cached hand region first; crop landmarks are mapped
+            # back to full-frame normalized coordinates
+            if self.roi is not None:
+                x0, y0, x1, y1 = self.roi
+                crop = np.ascontiguousarray(frame[y0:y1, x0:x1])
+                crop_landmarks, score = self._process(crop, crop=True)
+                if crop_landmarks and score >= self.roi_min_confidence:
+                    cw, ch = x1 - x0, y1 - y0
+                    landmarks = [((x * cw + x0) / w, (y * ch + y0) / h)
+                                 for x, y in crop_landmarks]
+
+            # Fall back to the full frame when the hand left the region
+            if landmarks is None:
+                landmarks, _ = self._process(frame)
+
+            t_infer = time.monotonic() - t0
+            if t_infer > self.inference_budget:
+                self._skip_until = time.monotonic() + t_infer
+
+            if landmarks:
+                self._update_roi(landmarks, w, h)
                 self.last_landmarks = landmarks
                 return landmarks
+            self.roi = None
             return self.last_landmarks
         except Exception as e:
             print(f"Error processing hand landmarks: {e}")
+            self.roi = None
             return self.last_landmarks
 
     def close(self):
         """Clean up resources"""
+        self._running = False
+        self._capture_thread.join(timeout=1.0)
         if self.cap is not None:
             self.cap.release()
-        self.hands.close() 
\ No newline at end of file
+        if self.landmarker is not None:
+            self.landmarker.close()
+        else:
+            self.hands.close()
+        if self.crop_landmarker is not None:
+            self.crop_landmarker.close()
+        else:
+            self.crop_hands.close()
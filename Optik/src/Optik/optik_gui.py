@@ -2,7 +2,9 @@
 import sys, os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 import traceback
-import cv2
+import queue
+import threading
+import time
 from PySide6 import QtWidgets, QtCore, QtGui
 from PySide6.QtCore import Qt
 
@@ -34,6 +36,8 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 class OptikApp(QtWidgets.QMainWindow):
+    # Emitted from the capture thread with mirrored landmarks; Qt queues it onto the UI thread
+    landmarks_ready = QtCore.Signal(object)
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Optik Hand Control")
@@ -55,14 +59,22 @@ class OptikApp(QtWidgets.QMainWindow):
         """)
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
-        self.status_label = QtWidgets.QLabel("Status: Not Tracking")
-        self.status_label.setStyleSheet("""
+        self._style_idle = """
             QLabel {
                 font-size: 14px;
                 color: #7f8c8d;
                 padding: 5px;
             }
-        """)
+        """
+        self._style_active = """
+            QLabel {
+                font-size: 14px;
+                color: #27ae60;
+                padding: 5px;
+            }
+        """
+        self.status_label = QtWidgets.QLabel("Status: Not Tracking")
+        self.status_label.setStyleSheet(self._style_idle)
         self.status_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.status_label)
         self.start_btn = QtWidgets.QPushButton("Start Tracking")
@@ -100,49 +112,79 @@ class OptikApp(QtWidgets.QMainWindow):
         self.tracker = HandTracker()
         self.controller = HandController()
         self.speech = SpeechDictation()
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(30)
-        self.timer.timeout.connect(self._on_frame)
+        self.landmarks_ready.connect(self._on_landmarks)
+        self.min_frame_interval = 1.0 / 60  # Upper bound on the processing rate
+        self.last_frame_time = 0.0
         self.is_tracking = False
+        # Kalman, gestures and mouse/keyboard output run on a worker thread
+        # fed with the newest landmarks, overlapping with MediaPipe inference
+        self.landmark_queue = queue.Queue(maxsize=1)
+        self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
+        self.control_thread.start()
+        # Frames are pulled from the tracker and run through MediaPipe on
+        # their own thread, so neither the camera nor inference blocks the Qt
+        # event loop; only the resulting landmarks reach the UI thread
+        self.capture_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
     def start_tracking(self):
         self.is_tracking = True
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.status_label.setText("Status: Tracking Active")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                color: #27ae60;
-                padding: 5px;
-            }
-        """)
-        self.timer.start()
+        self.status_label.setStyleSheet(self._style_active)
     def stop_tracking(self):
         self.is_tracking = False
-        self.timer.stop()
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.status_label.setText("Status: Not Tracking")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                font-size: 14px;
-                color: #7f8c8d;
-                padding: 5px;
-            }
-        """)
-    def _on_frame(self):
-        if not self.is_tracking:
-            return
-        frame = self.tracker.next_frame()
-        if frame is None:
-            return
-        frame = cv2.flip(frame, 1)
-        lm = self.tracker.get_landmarks(frame)
-        if lm:
-            self.controller.update(lm)
+        self.status_label.setStyleSheet(self._style_idle)
+    def _on_landmarks(self, lm):
+        if self.is_tracking:
+            self._post_landmarks(lm)
+    @staticmethod
+    def _put_latest(q, item):
+        # Keep only the freshest item; a stale pending one is dropped
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+    def _post_landmarks(self, lm):
+        self._put_latest(self.landmark_queue, lm)
+    def _capture_loop(self):
+        while self.capture_running:
+            if not self.is_tracking:
+                time.sleep(0.05)
+                continue
+            frame = self.tracker.next_raw_frame()
+            if frame is None:
+                continue
+            now = time.monotonic()
+            if now - self.last_frame_time < self.min_frame_interval:
+                continue
+            self.last_frame_time = now
+            # Convert into the tracker's reused buffer and infer right here,
+            # off the UI thread
+            lm = self.tracker.get_landmarks(self.tracker.to_rgb(frame))
+            if lm:
+                # Mirror the 21 landmarks rather than every pixel of the frame
+                self.landmarks_ready.emit([(1.0 - x, y) for x, y in lm])
+    def _control_loop(self):
+        while True:
+            lm = self.landmark_queue.get()
+            if lm is None:
+                break
+            gestures = self.controller.update(lm)
+            if gestures and gestures['dictation']:
+                self.speech.trigger()
             self.speech.update(lm)
     def closeEvent(self, event):
         self.stop_tracking()
+        self.capture_running = False
+        self.capture_thread.join(timeout=1.0)
+        self._post_landmarks(None)
+        self.control_thread.join(timeout=1.0)
         self.controller.close()
         event.accept()
 def main():
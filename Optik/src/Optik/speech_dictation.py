@@ -6,19 +6,28 @@ class SpeechDictation:
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         self.last_text = ""
+        # Set by trigger(); the listener stays idle until then
+        self._active = threading.Event()
         self.thread = threading.Thread(target=self.listen, daemon=True)
         self.thread.start()
 
+    def trigger(self):
+        """Listen for and recognize one phrase"""
+        self._active.set()
+
     def listen(self):
         while True:
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, phrase_time_limit=3)
+            self._active.wait()
             try:
+                with self.microphone as source:
+                    audio = self.recognizer.listen(source, phrase_time_limit=3)
                 text = self.recognizer.recognize_google(audio)
                 self.last_text = text
                 print(f"Recognized: {text}")
             except Exception:
                 pass
+            finally:
+                self._active.clear()
 
     def update(self, landmarks):
         pass 
\ No newline at end of file
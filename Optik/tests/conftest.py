@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# The kernel tests import the Optik package and the desktop app under the
+# repository's top-level src/, so put both on the path when run from a checkout
+ROOT = Path(__file__).resolve().parents[2]
+for path in (ROOT / "Optik" / "src", ROOT):
+    if path.is_dir() and str(path) not in sys.path:
+        sys.path.insert(0, str(path))
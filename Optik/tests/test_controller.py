@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("src.controller")  # Needs pyautogui
+from src.controller import (
+    ACT_CLICK, ACT_DICTATION, ACT_ENTER, ACT_MOUSE_DOWN, ACT_MOUSE_UP,
+    ACT_SCROLL_DOWN, ACT_SCROLL_UP, PINCH_THRESHOLD_NS, SCROLL_SPEED_NS, decide,
+)
+
+T0 = 1_000_000_000  # decide() treats a zero pinch start as "not pinching"
+
+
+def _hand(fingers="00000", pinch=False):
+    """(21, 2) landmarks with the given fingers (thumb first) extended."""
+    pts = np.zeros((21, 2), np.float32)
+    for i, (tip, out) in enumerate(zip((4, 8, 12, 16, 20), fingers)):
+        pts[tip - 2] = (0.1 * i, 0.5)
+        pts[tip] = (0.1 * i, 0.3 if out == "1" else 0.7)
+    if pinch:
+        pts[4] = pts[8] + (0.01, 0.0)
+    return pts
+
+
+def _state():
+    return np.zeros(5, np.int64)
+
+
+def test_click_fires_once_per_pinch():
+    state = _state()
+    pinched = _hand("01000", pinch=True)
+    assert decide(pinched, state, T0) & ACT_CLICK
+    assert not decide(pinched, state, T0 + 1) & ACT_CLICK
+    assert not decide(_hand("01000"), state, T0 + 2) & ACT_CLICK
+    assert decide(pinched, state, T0 + 3) & ACT_CLICK
+
+
+def test_drag_starts_after_hold_and_releases():
+    state = _state()
+    pinched = _hand("01000", pinch=True)
+    assert not decide(pinched, state, T0) & ACT_MOUSE_DOWN
+    assert not decide(pinched, state, T0 + PINCH_THRESHOLD_NS - 1) & ACT_MOUSE_DOWN
+    assert decide(pinched, state, T0 + PINCH_THRESHOLD_NS) & ACT_MOUSE_DOWN
+    assert not decide(pinched, state, T0 + 2 * PINCH_THRESHOLD_NS) & ACT_MOUSE_DOWN
+    assert decide(_hand("01000"), state, T0 + 3 * PINCH_THRESHOLD_NS) == ACT_MOUSE_UP
+
+
+def test_short_pinch_never_drags():
+    state = _state()
+    decide(_hand("01000", pinch=True), state, T0)
+    assert not decide(_hand("01000"), state, T0 + 1) & ACT_MOUSE_UP
+    assert not decide(_hand("01000", pinch=True), state, T0 + PINCH_THRESHOLD_NS) & ACT_MOUSE_DOWN
+
+
+def test_enter_fires_on_gesture_start():
+    state = _state()
+    assert decide(_hand("10000"), state, T0) == ACT_ENTER
+    assert decide(_hand("10000"), state, T0 + 1) == 0
+
+
+def test_dictation_fires_on_release():
+    state = _state()
+    assert decide(_hand("10001"), state, T0) == 0
+    assert decide(_hand("10001"), state, T0 + 1) == 0
+    assert decide(_hand("00000"), state, T0 + 2) == ACT_DICTATION
+
+
+def test_dictation_straight_to_enter_does_both():
+    state = _state()
+    decide(_hand("10001"), state, T0)
+    assert decide(_hand("10000"), state, T0 + 1) == ACT_DICTATION | ACT_ENTER
+
+
+@pytest.mark.parametrize("fingers, action", [("01110", ACT_SCROLL_UP), ("01100", ACT_SCROLL_DOWN)])
+def test_scroll_repeats_at_scroll_speed(fingers, action):
+    state = _state()
+    assert decide(_hand(fingers), state, T0) == action
+    assert decide(_hand(fingers), state, T0 + SCROLL_SPEED_NS - 1) == 0
+    assert decide(_hand(fingers), state, T0 + SCROLL_SPEED_NS) == action
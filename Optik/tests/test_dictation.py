@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("src.dictation")  # Needs OpenCV and MediaPipe
+from src.dictation import AUDIO_RING, SpeechDictation
+
+
+@pytest.fixture
+def dictation():
+    # The recognizer and microphone are only opened by _ensure_listening
+    return SpeechDictation()
+
+
+def test_empty_ring_pops_none(dictation):
+    assert dictation._pop_audio() is None
+
+
+def test_phrases_come_out_in_order(dictation):
+    for i in range(3):
+        dictation._push_audio(i)
+    assert [dictation._pop_audio() for _ in range(4)] == [0, 1, 2, None]
+
+
+def test_ring_wraps_around(dictation):
+    # Interleave pushes and pops so the indices pass the end of the ring
+    # several times over
+    popped = []
+    for i in range(3 * AUDIO_RING + 5):
+        dictation._push_audio(i)
+        if i % 3 == 2:
+            popped += [dictation._pop_audio() for _ in range(3)]
+    while (audio := dictation._pop_audio()) is not None:
+        popped.append(audio)
+    assert popped == list(range(3 * AUDIO_RING + 5))
+
+
+def test_full_ring_drops_new_phrases(dictation):
+    for i in range(AUDIO_RING + 3):
+        dictation._push_audio(i)
+    assert dictation._tail - dictation._head == AUDIO_RING
+    assert [dictation._pop_audio() for _ in range(AUDIO_RING)] == list(range(AUDIO_RING))
+    assert dictation._pop_audio() is None
+    # Space freed by the consumer is usable again
+    dictation._push_audio("next")
+    assert dictation._pop_audio() == "next"
+
+
+def test_popped_slots_are_cleared(dictation):
+    dictation._push_audio(object())
+    dictation._pop_audio()
+    assert dictation._audio_ring == [None] * AUDIO_RING
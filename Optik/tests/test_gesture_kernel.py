@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.gesture_kernel import CURSOR_IDX, process_landmarks
+
+SCREEN_W, SCREEN_H = 1920, 1080
+
+
+def _luts(size=1024):
+    grid = np.linspace(0, 1, size)
+    x_lut = (grid * SCREEN_W).clip(0, SCREEN_W - 1).astype(np.float32)
+    y_lut = (grid * SCREEN_H).clip(0, SCREEN_H - 1).astype(np.float32)
+    return x_lut, y_lut
+
+
+def _map(x, y):
+    pts = np.zeros((21, 2), np.float32)
+    pts[CURSOR_IDX] = (x, y)
+    box = np.array([0.0, 1.0, 0.0, 1.0], np.float32)
+    target_x, target_y, _, _ = process_landmarks(pts, box, *_luts())
+    return target_x, target_y
+
+
+def test_box_edges_map_to_screen_edges():
+    assert _map(0.0, 0.0) == (0.0, 0.0)
+    assert _map(1.0, 1.0) == (SCREEN_W - 1, SCREEN_H - 1)
+
+
+def test_points_outside_the_box_are_clamped():
+    assert _map(-0.2, -0.5) == (0.0, 0.0)
+    assert _map(1.3, 2.0) == (SCREEN_W - 1, SCREEN_H - 1)
+
+
+def test_lookup_interpolates_between_entries():
+    # Halfway between two table entries lands halfway between their pixels
+    top = 1023
+    x_lut, _ = _luts()
+    target_x, _ = _map(100.5 / top, 0.5)
+    assert target_x == pytest.approx((x_lut[100] + x_lut[101]) / 2, abs=1e-3)
+
+
+def test_mapping_is_monotonic_without_stair_steps():
+    xs = np.linspace(0.0, 1.0, 5000)
+    mapped = np.array([_map(x, 0.5)[0] for x in xs])
+    assert np.all(np.diff(mapped) > 0)
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("Optik.hand_controller")  # Needs the full app stack
+from Optik.hand_controller import GESTURES, _gesture_core
+
+# HandController's defaults: squared pinch/enter/finger-out/curl thresholds,
+# click/drag/enter/dictation cooldowns and the dictation hold time
+PARAMS = (0.04 ** 2, 0.08 ** 2, 0.08 ** 2, 0.07 ** 2, 0.5, 0.2, 1.0, 2.0, 1.0)
+
+
+def _state():
+    return np.array([0.0, 0.0, 0.0, 0.0, -1.0])
+
+
+def _neutral():
+    """Landmarks spread along a line: far apart, nothing pointing up."""
+    L = np.zeros((21, 2))
+    L[:, 0] = 0.2 + 0.03 * np.arange(21)
+    L[:, 1] = 0.5
+    return L
+
+
+def _pinch():
+    L = _neutral()
+    L[4] = L[8] + (0.01, 0.0)
+    return L
+
+
+def _curl(L, tips):
+    for tip in tips:
+        L[tip] = L[0] + (0.02, 0.0)
+    return L
+
+
+def _fist():
+    L = _curl(_neutral(), (8, 12, 16, 20))
+    L[9, 1] = 0.6  # Wrist above the middle knuckle
+    return L
+
+
+def _dictation():
+    L = _curl(_neutral(), (8, 12, 16))
+    L[4] = L[2] + (0.1, 0.0)
+    L[20] = L[18] + (0.1, 0.0)
+    return L
+
+
+def _fingers_up(*tips):
+    L = _neutral()
+    for i, tip in enumerate(tips):
+        L[tip, 1] = 0.3 + 0.1 * i
+    return L
+
+
+def _run(L, now, state, dragging=False):
+    g = _gesture_core(L, now, dragging, state, PARAMS)
+    return {name for name, on in zip(GESTURES, g) if on}
+
+
+def test_neutral_hand_fires_nothing():
+    assert _run(_neutral(), 10.0, _state()) == set()
+
+
+def test_pinch_clicks_and_drags_with_cooldowns():
+    state = _state()
+    assert _run(_pinch(), 10.0, state) == {'click', 'drag'}
+    assert _run(_pinch(), 10.1, state) == set()
+    assert _run(_pinch(), 10.3, state) == {'drag'}
+    assert _run(_pinch(), 10.6, state, dragging=True) == {'click'}
+
+
+def test_fist_presses_enter_once_per_cooldown():
+    state = _state()
+    assert _run(_fist(), 10.0, state) == {'enter'}
+    assert _run(_fist(), 10.5, state) == set()
+    assert _run(_fist(), 11.1, state) == {'enter'}
+
+
+def test_dictation_needs_the_gesture_held():
+    state = _state()
+    assert 'dictation' not in _run(_dictation(), 10.0, state)
+    assert 'dictation' not in _run(_dictation(), 10.9, state)
+    assert 'dictation' in _run(_dictation(), 11.1, state)
+    assert state[4] < 0  # Hold timer restarts after firing
+
+
+def test_dictation_hold_resets_when_released():
+    state = _state()
+    _run(_dictation(), 10.0, state)
+    _run(_neutral(), 10.5, state)
+    assert state[4] < 0
+    assert 'dictation' not in _run(_dictation(), 10.6, state)
+    assert 'dictation' not in _run(_dictation(), 11.2, state)
+    assert 'dictation' in _run(_dictation(), 11.7, state)
+
+
+def test_dictation_cooldown():
+    state = _state()
+    _run(_dictation(), 10.0, state)
+    assert 'dictation' in _run(_dictation(), 11.1, state)
+    _run(_dictation(), 11.2, state)
+    # Held long enough, but still cooling down from the last dictation
+    assert 'dictation' not in _run(_dictation(), 12.3, state)
+    assert 'dictation' in _run(_dictation(), 13.2, state)
+
+
+@pytest.mark.parametrize("tips, gesture", [
+    ((8, 12), 'scroll_up'),
+    ((12, 8), 'scroll_down'),
+    ((16, 20), 'right_click'),
+])
+def test_pointing_gestures(tips, gesture):
+    assert _run(_fingers_up(*tips), 10.0, _state()) == {gesture}
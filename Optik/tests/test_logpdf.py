@@ -0,0 +1,59 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+stats = pytest.importorskip("scipy.stats")
+
+# The vendored filterpy lives in the backup app's Optik package, which would
+# shadow this app's; load the module on its own
+LOGPDF_PATH = (Path(__file__).resolve().parents[2]
+               / "Optik_backup" / "src" / "Optik" / "filterpy" / "logpdf.py")
+if not LOGPDF_PATH.exists():
+    pytest.skip("vendored filterpy not in this checkout", allow_module_level=True)
+_spec = importlib.util.spec_from_file_location("vendored_logpdf", LOGPDF_PATH)
+vendored = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(vendored)
+logpdf = vendored.logpdf
+
+
+def _random_cov(rng, k):
+    a = rng.standard_normal((k, k))
+    return a @ a.T + k * np.eye(k)
+
+
+@pytest.mark.parametrize("k", [1, 2, 4])
+def test_matches_scipy(k):
+    rng = np.random.default_rng(k)
+    cov = _random_cov(rng, k)
+    mean = rng.standard_normal(k)
+    for x in rng.standard_normal((5, k)):
+        expected = stats.multivariate_normal.logpdf(x, mean=mean, cov=cov)
+        assert logpdf(x, mean, cov) == pytest.approx(expected, rel=1e-10)
+
+
+def test_scalar_covariance():
+    expected = stats.multivariate_normal.logpdf(1.0, cov=2.0)
+    assert logpdf(1.0, cov=2.0) == pytest.approx(expected, rel=1e-10)
+
+
+def test_covariance_changed_in_place_is_refactored():
+    # Filters update S in place, so the same array object must not hit the cache
+    rng = np.random.default_rng(0)
+    cov = _random_cov(rng, 3)
+    x = rng.standard_normal(3)
+    logpdf(x, cov=cov)
+    cov *= 2.0
+    cov[0, 1] = cov[1, 0] = 0.5
+    expected = stats.multivariate_normal.logpdf(x, cov=cov)
+    assert logpdf(x, cov=cov) == pytest.approx(expected, rel=1e-10)
+
+
+def test_alternating_covariances():
+    rng = np.random.default_rng(1)
+    covs = [_random_cov(rng, 2) for _ in range(2)]
+    x = rng.standard_normal(2)
+    for cov in covs * 3:
+        expected = stats.multivariate_normal.logpdf(x, cov=cov)
+        assert logpdf(x, cov=cov) == pytest.approx(expected, rel=1e-10)
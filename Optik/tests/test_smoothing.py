@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.smoothing import KalmanSmoother
+
+
+class _MatrixKalman:
+    """The 4-state [x, y, dx, dy] filter KalmanSmoother is written out from."""
+
+    def __init__(self, r, q):
+        self.F = np.array([[1, 0, 1, 0],
+                           [0, 1, 0, 1],
+                           [0, 0, 0.95, 0],
+                           [0, 0, 0, 0.95]])
+        self.H = np.eye(2, 4)
+        self.R = np.eye(2) * r
+        self.Q = np.eye(4) * q
+        self.P = np.eye(4) * 1000.0
+        self.x = np.zeros(4)
+
+    def __call__(self, x, y):
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (np.array([x, y]) - self.H @ self.x)
+        self.P = (np.eye(4) - K @ self.H) @ self.P
+        return self.x[0], self.x[1]
+
+
+def test_converges_on_a_still_target():
+    smoother = KalmanSmoother(r=0.05)
+    for _ in range(200):
+        x, y = smoother(0.3, 0.7)
+    assert x == pytest.approx(0.3, abs=1e-6)
+    assert y == pytest.approx(0.7, abs=1e-6)
+    assert smoother.dx == pytest.approx(0.0, abs=1e-6)
+
+
+def test_follows_a_steady_motion():
+    smoother = KalmanSmoother(r=0.05)
+    for i in range(300):
+        x, y = smoother(0.001 * i, 0.5)
+    # Velocity damping leaves a small constant lag behind the target
+    assert x == pytest.approx(0.299, abs=0.01)
+    assert y == pytest.approx(0.5, abs=1e-6)
+
+
+@pytest.mark.parametrize("r, q", [(0.05, 0.01), (2.5, 0.03)])
+def test_matches_the_matrix_filter(r, q):
+    rng = np.random.default_rng(0)
+    smoother = KalmanSmoother(r=r, q=q)
+    reference = _MatrixKalman(r, q)
+    for x, y in rng.random((100, 2)):
+        assert smoother(x, y) == pytest.approx(reference(x, y), rel=1e-9, abs=1e-12)
@@ -1,7 +1,33 @@
 import numpy as np
 
-def logpdf(x, mean, cov):
+# Factorization of the last covariance seen. Kalman filters call logpdf with
+# the same (or an unchanged) covariance over and over, so the O(k^3) work is
+# only redone when cov actually changes. The entry is one (cov, L_inv,
+# log_det) tuple swapped in whole, so a thread always reads a factor and
+# log-determinant of the same matrix; it is keyed on a private copy of
+# cov's contents, because filters update their covariance in place.
+_cache = None
+
+def _factor(cov):
+    """Return (inverse Cholesky factor, log-determinant) of cov, cached."""
+    entry = _cache
+    if entry is not None and entry[0].shape == cov.shape and np.array_equal(entry[0], cov):
+        return entry[1], entry[2]
+    return _refactor(cov)
+
+def _refactor(cov):
+    global _cache
+    L = np.linalg.cholesky(cov)
+    L_inv = np.linalg.inv(L)
+    log_det = 2.0 * np.sum(np.log(np.diag(L)))
+    _cache = (cov.copy(), L_inv, log_det)
+    return L_inv, log_det
+
+def logpdf(x, mean=None, cov=1):
     """Minimal logpdf for multivariate normal."""
-    k = len(mean)
-    x_m = x - mean
-    return -0.5 * (np.log(np.linalg.det(cov)) + k * np.log(2 * np.pi) + x_m.T @ np.linalg.inv(cov) @ x_m) 
\ No newline at end of file
+    x_m = np.ravel(x) if mean is None else np.ravel(x) - np.ravel(mean)
+    cov = np.atleast_2d(cov)
+    k = len(x_m)
+    L_inv, log_det = _factor(cov)
+    z = L_inv @ x_m
+    return -0.5 * (log_det + k * np.log(2 * np.pi) + z @ z)
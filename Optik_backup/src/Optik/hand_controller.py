@@ -47,6 +47,7 @@ class HandController:
         self.kf.R = np.eye(2) * KAL_R
         self.kf.Q = np.eye(4) * KAL_Q
         self.kf.x = np.array([0,0,0,0], float)
+        self._z = np.empty(2)  # Reused observation vector
 
         # pinch/drag state
         self.pinch_t0    = None
@@ -81,6 +82,7 @@ class HandController:
         else:
             self._handle_pinch(lm)
 
+        # Exactly one of these steps the Kalman filter (one predict per frame)
         if not self.drag:
             self._move_filtered(kn.x, kn.y)
         else:
@@ -173,8 +175,9 @@ class HandController:
                 return
         
         # Update Kalman filter
+        self._z[0] = mx; self._z[1] = my
         self.kf.predict()
-        self.kf.update(np.array([mx, my]))
+        self.kf.update(self._z)
         
         # Get smoothed position
         cx, cy = self.kf.x[:2]
@@ -218,8 +221,9 @@ class HandController:
                 return
         
         # Apply Kalman filtering to drag movement
+        self._z[0] = nx; self._z[1] = ny
         self.kf.predict()
-        self.kf.update(np.array([nx, ny]))
+        self.kf.update(self._z)
         nx, ny = self.kf.x[:2]
         
         # Ensure we can still move in both axes even at screen edges
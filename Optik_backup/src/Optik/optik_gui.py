@@ -28,6 +28,8 @@ except Exception as e:
     traceback.print_exc()
     sys.exit(1)
 
+UMAT_FLIP_PIXELS = 640 * 480  # Frame size above which the flip goes through cv2.UMat
+
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
@@ -168,8 +170,12 @@ class OptikApp(QtWidgets.QMainWindow):
         if frame is None:
             return
             
-        # Flip frame horizontally for proper mirroring
-        frame = cv2.flip(frame, 1)
+        # Flip frame horizontally for proper mirroring. Above VGA the copy is
+        # memory-bound, so let OpenCV's T-API (OpenCL) do it
+        if frame.shape[0] * frame.shape[1] > UMAT_FLIP_PIXELS:
+            frame = cv2.flip(cv2.UMat(frame), 1).get()
+        else:
+            frame = cv2.flip(frame, 1)
         
         # Process hand tracking
         lm = self.tracker.get_landmarks(frame)
@@ -181,6 +187,7 @@ class OptikApp(QtWidgets.QMainWindow):
         """Handle application close"""
         self.stop_tracking()
         self.controller.close()
+        self.speech.close()
         event.accept()
 
 def main():
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 import speech_recognition as sr, threading, queue, time, pyautogui, re
+from functools import partial
+from pyautogui import (hotkey as _hk, scroll as _sc, click as _cl, doubleClick as _dc,
+                       rightClick as _rc, press as _pr, write as _wr)
 
 # ── tuning ────────────────────────────────────────────
 TOL        = 0.02  # reduced for more precise gesture detection
@@ -7,33 +10,44 @@ MAX_SPEECH = 15    # increased max speech duration
 SPEECH_CD  = 0.3   # reduced cooldown between speech sessions
 AMBIENT_DURATION = 0.1  # reduced ambient noise calibration time
 
+def _open_chrome():
+    # Each step runs regardless of what the previous call returned
+    _hk('command', 'space')
+    _wr('chrome')
+    _pr('enter')
+
 # Voice commands mapping
 VOICE_COMMANDS = {
-    'open chrome': lambda: pyautogui.hotkey('command', 'space') and pyautogui.write('chrome') and pyautogui.press('enter'),
-    'scroll down': lambda: pyautogui.scroll(-100),
-    'scroll up': lambda: pyautogui.scroll(100),
-    'click': lambda: pyautogui.click(),
-    'double click': lambda: pyautogui.doubleClick(),
-    'right click': lambda: pyautogui.rightClick(),
-    'copy': lambda: pyautogui.hotkey('command', 'c'),
-    'paste': lambda: pyautogui.hotkey('command', 'v'),
-    'cut': lambda: pyautogui.hotkey('command', 'x'),
-    'select all': lambda: pyautogui.hotkey('command', 'a'),
-    'undo': lambda: pyautogui.hotkey('command', 'z'),
-    'redo': lambda: pyautogui.hotkey('command', 'shift', 'z'),
-    'new tab': lambda: pyautogui.hotkey('command', 't'),
-    'close tab': lambda: pyautogui.hotkey('command', 'w'),
-    'switch tab': lambda: pyautogui.hotkey('command', 'tab'),
-    'refresh': lambda: pyautogui.hotkey('command', 'r'),
-    'go back': lambda: pyautogui.hotkey('command', '['),
-    'go forward': lambda: pyautogui.hotkey('command', ']'),
-    'zoom in': lambda: pyautogui.hotkey('command', '+'),
-    'zoom out': lambda: pyautogui.hotkey('command', '-'),
-    'full screen': lambda: pyautogui.hotkey('command', 'f'),
-    'minimize': lambda: pyautogui.hotkey('command', 'm'),
-    'quit': lambda: pyautogui.hotkey('command', 'q'),
+    'open chrome': _open_chrome,
+    'scroll down': partial(_sc, -100),
+    'scroll up': partial(_sc, 100),
+    'click': _cl,
+    'double click': _dc,
+    'right click': _rc,
+    'copy': partial(_hk, 'command', 'c'),
+    'paste': partial(_hk, 'command', 'v'),
+    'cut': partial(_hk, 'command', 'x'),
+    'select all': partial(_hk, 'command', 'a'),
+    'undo': partial(_hk, 'command', 'z'),
+    'redo': partial(_hk, 'command', 'shift', 'z'),
+    'new tab': partial(_hk, 'command', 't'),
+    'close tab': partial(_hk, 'command', 'w'),
+    'switch tab': partial(_hk, 'command', 'tab'),
+    'refresh': partial(_hk, 'command', 'r'),
+    'go back': partial(_hk, 'command', '['),
+    'go forward': partial(_hk, 'command', ']'),
+    'zoom in': partial(_hk, 'command', '+'),
+    'zoom out': partial(_hk, 'command', '-'),
+    'full screen': partial(_hk, 'command', 'f'),
+    'minimize': partial(_hk, 'command', 'm'),
+    'quit': partial(_hk, 'command', 'q'),
 }
 
+# One pass over the text for all commands; longer phrases come first so
+# 'double click' wins over 'click' at the same position
+VOICE_COMMAND_RE = re.compile(r'\b(?:%s)\b' % '|'.join(
+    re.escape(cmd) for cmd in sorted(VOICE_COMMANDS, key=len, reverse=True)))
+
 def ext(lm, tip, pip):  return lm[tip].y < lm[pip].y - TOL
 def cur(lm, tip, pip):  return lm[tip].y > lm[pip].y + TOL
 
@@ -48,12 +62,21 @@ class SpeechDictation:
         self.state = "idle"
         self.stop_flag = False
         self.last_speech = 0
-        self.audio_q = queue.Queue()
+        self.audio_q = queue.Queue(maxsize=2)  # Freshest phrases only; None stops _worker
         self.enter_t0 = None; self.last_enter = 0
         self.f3_t0    = None; self.last_f3 = 0
         self.is_recording = False
         self.recording_thread = None
+        # Open and calibrate the microphone once; dynamic_energy_threshold
+        # keeps adapting the threshold across sessions
         self.mic = None
+        try:
+            self.mic = sr.Microphone()
+            with self.mic as source:
+                self.rec.adjust_for_ambient_noise(source, duration=AMBIENT_DURATION)
+        except Exception as e:
+            print(f"Microphone setup error: {e}")
+            self.mic = None
         threading.Thread(target=self._worker, daemon=True).start()
 
     def update(self, lm):
@@ -100,15 +123,15 @@ class SpeechDictation:
         # F3 gesture removed as it's not part of the spec
 
     def _record(self):
+        if self.mic is None:
+            return
         try:
-            self.mic = sr.Microphone()
             with self.mic as source:
-                self.rec.adjust_for_ambient_noise(source, duration=AMBIENT_DURATION)
                 while self.is_recording and not self.stop_flag:
                     try:
                         audio = self.rec.listen(source, phrase_time_limit=MAX_SPEECH)
                         if not self.stop_flag:
-                            self.audio_q.put(audio)
+                            self._put_audio(audio)
                     except sr.WaitTimeoutError:
                         continue
                     except Exception as e:
@@ -117,17 +140,37 @@ class SpeechDictation:
         except Exception as e:
             print(f"Speech recognition error: {e}")
 
+    def _put_audio(self, audio):
+        # Drop the oldest phrase when recognition falls behind
+        while True:
+            try:
+                self.audio_q.put_nowait(audio)
+                return
+            except queue.Full:
+                try:
+                    self.audio_q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        """Stop recording and let the recognition worker exit"""
+        self.is_recording = False
+        self.stop_flag = True
+        self._put_audio(None)
+
     def _worker(self):
         while True:
             try:
                 audio = self.audio_q.get()
+                if audio is None:
+                    break
                 text = self.rec.recognize_google(audio).lower()
                 
                 # Check for voice commands first
-                for cmd, action in VOICE_COMMANDS.items():
-                    if cmd in text:
-                        action()
-                        return
+                m = VOICE_COMMAND_RE.search(text)
+                if m:
+                    VOICE_COMMANDS[m.group(0)]()
+                    continue
                 
                 # If no command matched, treat as dictation
                 pyautogui.typewrite(text + " ")
@@ -2,10 +2,17 @@
 import cv2
 import numpy as np
 
+from .config import CAMERA_W, CAMERA_H, CAMERA_FOURCC
+
 class Camera:
     def __init__(self):
         print("Initializing camera...")
         self.cap = cv2.VideoCapture(0)
+        # Ask for MJPEG at a small size before setting the rate; drivers
+        # that can't honour these keep their defaults
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAMERA_FOURCC))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_W)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_H)
         self.cap.set(cv2.CAP_PROP_FPS, 60)
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # drop old frames
         if not self.cap.isOpened():
@@ -15,7 +22,7 @@ class Camera:
     def read(self):
         """Read a frame from the camera."""
         return self.cap.read()
-        
+
     def release(self):
         """Release the camera resources."""
         self.cap.release()
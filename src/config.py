@@ -15,4 +15,7 @@ TOUCH_DIST_PX = 40             # max pixel distance between tips counted as "tou
 DICTATION_TIMEOUT = 5          # seconds of silence to auto‑stop
 
 # Performance
-FPS = 30                       # camera FPS target 
\ No newline at end of file
+FPS = 30                       # camera FPS target 
+CAMERA_W = 640                 # capture size; MediaPipe downscales to its own input anyway
+CAMERA_H = 480
+CAMERA_FOURCC = 'MJPG'         # compressed stream the camera can deliver fastest
@@ -3,9 +3,24 @@ import pyautogui, math, time, threading
 import numpy as np
 from collections import deque
 import traceback
-from filterpy.kalman import KalmanFilter
+import logging
 from typing import List, Tuple
 
+try:
+    import Quartz  # macOS only
+except ImportError:
+    Quartz = None
+
+try:
+    from numba import njit
+except ImportError:  # Run decide() as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+log = logging.getLogger(__name__)
+
 # Constants for fine-tuning
 PINCH_THRESH = 0.05
 DRAG_DELAY = 0.1
@@ -29,17 +44,138 @@ SPEED_MULTIPLIER = 1.5      # Increased for faster movement
 BOX_RESET_RATE = 0.1
 BASE_SENSITIVITY = 1.0
 EDGE_SENSITIVITY = 1.5
+PINCH_DIST = 0.1                  # pointer-thumb distance that counts as a pinch
+PINCH_SQ = PINCH_DIST * PINCH_DIST  # compared against squared distances
+PINCH_THRESHOLD_NS = 300_000_000  # hold pinch this long before drag starts
+SCROLL_SPEED_NS = 5_000_000       # minimum gap between scroll steps
 
 # Disable pyautogui delays
 pyautogui.PAUSE = 0
 pyautogui.FAILSAFE = False
 
-def dist(a, b):
-    return math.hypot(a.x - b.x, a.y - b.y)
+# Input events: posted straight to Quartz on macOS, pyautogui elsewhere
+KEY_CODES = {'enter': 36}  # macOS virtual key codes
+
+def _post_mouse(event_type):
+    pos = Quartz.CGEventGetLocation(Quartz.CGEventCreate(None))
+    ev = Quartz.CGEventCreateMouseEvent(None, event_type, pos, Quartz.kCGMouseButtonLeft)
+    Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+def _click_down():
+    if Quartz is None:
+        pyautogui.mouseDown()
+        return
+    _post_mouse(Quartz.kCGEventLeftMouseDown)
+
+def _click_up():
+    if Quartz is None:
+        pyautogui.mouseUp()
+        return
+    _post_mouse(Quartz.kCGEventLeftMouseUp)
+
+def _click():
+    if Quartz is None:
+        pyautogui.click()
+        return
+    _post_mouse(Quartz.kCGEventLeftMouseDown)
+    _post_mouse(Quartz.kCGEventLeftMouseUp)
+
+def _scroll(dy):
+    if Quartz is None:
+        pyautogui.scroll(dy)
+        return
+    ev = Quartz.CGEventCreateScrollWheelEvent(None, Quartz.kCGScrollEventUnitLine, 1, dy)
+    Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+def _key(name):
+    if Quartz is None:
+        pyautogui.press(name)
+        return
+    for down in (True, False):
+        ev = Quartz.CGEventCreateKeyboardEvent(None, KEY_CODES[name], down)
+        Quartz.CGEventPost(Quartz.kCGHIDEventTap, ev)
+
+# Thumb, index, middle, ring, pinky: fingertips and the joints they are compared to
+TIP_IDX = np.array([4, 8, 12, 16, 20])
+PIP_IDX = np.array([2, 6, 10, 14, 18])
+
+# Hand state (5 extension bits, thumb highest) -> gesture, 0 = none
+ENTER, SCROLL_UP, SCROLL_DOWN, DICTATION = range(1, 5)
+GESTURE_LUT = np.zeros(32, dtype=np.int64)
+GESTURE_LUT[0b10000] = ENTER      # Only thumb extended
+GESTURE_LUT[0b10001] = DICTATION  # Thumb and pinky extended
+for _thumb in (0, 0b10000):
+    GESTURE_LUT[_thumb | 0b01110] = SCROLL_UP    # Pointer, middle and ring
+    GESTURE_LUT[_thumb | 0b01100] = SCROLL_DOWN  # Pointer and middle
 
-def is_extended(landmarks, finger_tip_idx):
-    """Check if a finger is extended"""
-    return landmarks[finger_tip_idx].y < landmarks[finger_tip_idx - 2].y
+# Input events requested by decide()
+ACT_CLICK, ACT_ENTER, ACT_DICTATION = 1, 2, 4
+ACT_SCROLL_UP, ACT_SCROLL_DOWN = 8, 16
+ACT_MOUSE_DOWN, ACT_MOUSE_UP = 32, 64
+
+# Slots of the int64 state array passed to decide()
+CLICK_STATE, DRAG_STATE, GESTURE, PINCH_START, LAST_SCROLL = range(5)
+
+@njit(cache=True)
+def decide(pts, state, now):
+    """Gesture decisions for one frame of (21, 2) landmarks.
+
+    state holds [click_state, drag_state, gesture, pinch_start_ns,
+    last_scroll_ns] and is updated in place; now is time.monotonic_ns().
+    Returns the ACT_* bits for the input events to send.
+    """
+    actions = 0
+
+    # Pack the finger extension flags (tip above its PIP joint)
+    bits = 0
+    for i in range(5):
+        bits <<= 1
+        if pts[TIP_IDX[i], 1] < pts[PIP_IDX[i], 1]:
+            bits |= 1
+    gesture = GESTURE_LUT[bits]
+
+    dx = pts[8, 0] - pts[4, 0]
+    dy = pts[8, 1] - pts[4, 1]
+    pinching = dx * dx + dy * dy < PINCH_SQ
+
+    # Left click: pointer and thumb touch
+    if pinching:
+        if state[CLICK_STATE] == 0:
+            actions |= ACT_CLICK
+            state[CLICK_STATE] = 1
+    else:
+        state[CLICK_STATE] = 0
+
+    # Enter fires when the gesture starts; dictation when it is released.
+    # Checked separately: going straight from dictation to Enter does both
+    if gesture != state[GESTURE]:
+        if gesture == ENTER:
+            actions |= ACT_ENTER
+        if state[GESTURE] == DICTATION:
+            actions |= ACT_DICTATION
+        state[GESTURE] = gesture
+
+    # Scroll repeats while held
+    if gesture == SCROLL_UP or gesture == SCROLL_DOWN:
+        if now - state[LAST_SCROLL] >= SCROLL_SPEED_NS:
+            actions |= ACT_SCROLL_UP if gesture == SCROLL_UP else ACT_SCROLL_DOWN
+            state[LAST_SCROLL] = now
+
+    # Drag: pointer and thumb pinch held for threshold time
+    if pinching:
+        if state[DRAG_STATE] == 0:
+            if state[PINCH_START] == 0:
+                state[PINCH_START] = now
+            elif now - state[PINCH_START] >= PINCH_THRESHOLD_NS:
+                actions |= ACT_MOUSE_DOWN
+                state[DRAG_STATE] = 1
+    else:
+        if state[DRAG_STATE] != 0:
+            actions |= ACT_MOUSE_UP
+            state[DRAG_STATE] = 0
+        state[PINCH_START] = 0
+
+    return actions
 
 class HandController:
     def __init__(self):
@@ -51,20 +187,9 @@ class HandController:
         self.last_y = None
         self.alpha = 0.65  # Smoothing factor (0.5-0.7 is sweet spot)
         
-        # Gesture states
-        self.click_state = False
-        self.enter_state = False
-        self.scroll_state = False
-        self.drag_state = False
-        self.dictation_state = False
-        
-        # Drag control
-        self.pinch_start_time = 0
-        self.pinch_threshold = 0.3  # seconds to hold pinch before drag starts
-        
-        # Scroll control
-        self.last_scroll_time = time.time()
-        self.scroll_speed = 0.005  # Faster updates for smoother scrolling
+        # Gesture state for decide(); pinch start 0 = no pinch in progress
+        self.state = np.zeros(5, dtype=np.int64)
+        self.state[LAST_SCROLL] = time.monotonic_ns()
         
         print("Hand controller initialized successfully")
 
@@ -79,19 +204,6 @@ class HandController:
         self.last_x, self.last_y = smooth_x, smooth_y
         return smooth_x, smooth_y
 
-    @staticmethod
-    def _distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-
-    @staticmethod
-    def _is_extended(tip: Tuple[float, float], pip: Tuple[float, float]) -> bool:
-        return tip[1] < pip[1]
-
-    def _get_landmark(self, landmarks, idx: int) -> Tuple[float, float]:
-        if not landmarks or idx >= len(landmarks):
-            return (0.0, 0.0)
-        return (landmarks[idx].x, landmarks[idx].y)
-
     def _to_screen_coords(self, x: float, y: float) -> Tuple[int, int]:
         """Convert normalized coordinates (0-1) to screen coordinates, with horizontal inversion."""
         screen_x = int((1.0 - x) * self.screen_width)  # Invert x coordinate
@@ -104,101 +216,45 @@ class HandController:
             return self._to_screen_coords(0.5, 0.5)
 
         try:
+            # Copy the 21 landmarks into one array up front instead of going
+            # back to the landmark objects for every comparison
+            pts = np.fromiter((v for lm in landmarks[:21] for v in (lm.x, lm.y)),
+                              dtype=np.float32, count=42).reshape(21, 2)
+
             # Get cursor point from middle knuckle and smooth it
-            cursor_pt = self._get_landmark(landmarks, 14)  # Middle knuckle
-            smooth_x, smooth_y = self._smooth_position(*cursor_pt)
-            
-            # Get all needed landmark points
-            thumb_tip = self._get_landmark(landmarks, 4)
-            index_tip = self._get_landmark(landmarks, 8)
-            middle_tip = self._get_landmark(landmarks, 12)
-            ring_tip = self._get_landmark(landmarks, 16)
-            pinky_tip = self._get_landmark(landmarks, 20)
-            
-            # Get PIP joints for extension check
-            index_pip = self._get_landmark(landmarks, 6)
-            middle_pip = self._get_landmark(landmarks, 10)
-            ring_pip = self._get_landmark(landmarks, 14)
-            pinky_pip = self._get_landmark(landmarks, 18)
-            thumb_pip = self._get_landmark(landmarks, 2)
-
-            # Left click: pointer and thumb touch
-            if self._distance(index_tip, thumb_tip) < 0.1:
-                if not self.click_state:
-                    pyautogui.click()
-                    self.click_state = True
-            else:
-                self.click_state = False
-
-            # Enter: only thumb extended
-            if (self._is_extended(thumb_tip, thumb_pip) and
-                not self._is_extended(index_tip, index_pip) and
-                not self._is_extended(middle_tip, middle_pip) and
-                not self._is_extended(ring_tip, ring_pip) and
-                not self._is_extended(pinky_tip, pinky_pip)):
-                if not self.enter_state:
-                    pyautogui.press('enter')
-                    self.enter_state = True
-            else:
-                self.enter_state = False
-
-            # Scroll: pointer and middle extended (down) or pointer+middle+ring (up)
-            if (self._is_extended(index_tip, index_pip) and
-                self._is_extended(middle_tip, middle_pip) and
-                not self._is_extended(pinky_tip, pinky_pip)):
-                
-                current_time = time.time()
-                if current_time - self.last_scroll_time >= self.scroll_speed:
-                    if self._is_extended(ring_tip, ring_pip):  # Scroll up
-                        pyautogui.scroll(2)  # Increased scroll amount
-                    else:  # Scroll down
-                        pyautogui.scroll(-2)  # Increased scroll amount
-                    self.last_scroll_time = current_time
-                
-                if not self.scroll_state:
-                    self.scroll_state = True
-            else:
-                self.scroll_state = False
-
-            # Drag: pointer and thumb pinch held for threshold time
-            if self._distance(index_tip, thumb_tip) < 0.1:
-                current_time = time.time()
-                if not self.drag_state:
-                    if self.pinch_start_time == 0:
-                        self.pinch_start_time = current_time
-                    elif current_time - self.pinch_start_time >= self.pinch_threshold:
-                        pyautogui.mouseDown()
-                        self.drag_state = True
-            else:
-                if self.drag_state:
-                    pyautogui.mouseUp()
-                    self.drag_state = False
-                self.pinch_start_time = 0
-
-            # Dictation mode: trigger on gesture release
-            dictation_gesture = (self._is_extended(pinky_tip, pinky_pip) and
-                               self._is_extended(thumb_tip, thumb_pip) and
-                               not self._is_extended(index_tip, index_pip) and
-                               not self._is_extended(middle_tip, middle_pip) and
-                               not self._is_extended(ring_tip, ring_pip))
-            
-            if dictation_gesture:
-                self.dictation_state = True
-            elif self.dictation_state:  # Gesture was released
-                try:
-                    from .voice_mode import VoiceDictation
-                    if not VoiceDictation.active():
-                        threading.Thread(target=VoiceDictation.start, daemon=True).start()
-                except Exception as e:
-                    print(f"Dictation error: {str(e)}")
-                self.dictation_state = False
+            smooth_x, smooth_y = self._smooth_position(float(pts[14, 0]), float(pts[14, 1]))
+
+            # Decide in compiled code, then send the requested events in order
+            actions = decide(pts, self.state, time.monotonic_ns())
+            if actions & ACT_CLICK:
+                _click()
+            if actions & ACT_ENTER:
+                _key('enter')
+            if actions & ACT_DICTATION:
+                self._start_dictation()
+            if actions & ACT_SCROLL_UP:
+                _scroll(2)  # Increased scroll amount
+            if actions & ACT_SCROLL_DOWN:
+                _scroll(-2)
+            if actions & ACT_MOUSE_DOWN:
+                _click_down()
+            if actions & ACT_MOUSE_UP:
+                _click_up()
 
         except Exception as e:
-            print(f"Error in gesture processing: {str(e)}")
+            log.debug("Error in gesture processing: %s", e)
             return self._to_screen_coords(0.5, 0.5)
 
         return self._to_screen_coords(smooth_x, smooth_y)
 
+    def _start_dictation(self):
+        try:
+            from .voice_mode import VoiceDictation
+            if not VoiceDictation.active():
+                threading.Thread(target=VoiceDictation.start, daemon=True).start()
+        except Exception as e:
+            log.warning("Dictation error: %s", e)
+
     def start(self):
         """Start the hand controller."""
         print("Starting hand controller...")
@@ -212,131 +268,3 @@ class HandController:
     def close(self):
         """Clean up resources."""
         self.stop()
-
-    def _grow_box(self, pt):
-        if pt.x < self.minx: self.minx -= BOX_GROW*(self.minx-pt.x)
-        if pt.x > self.maxx: self.maxx += BOX_GROW*(pt.x-self.maxx)
-        if pt.y < self.miny: self.miny -= BOX_GROW*(self.miny-pt.y)
-        if pt.y > self.maxy: self.maxy += BOX_GROW*(pt.y-self.maxy)
-        self.minx, self.maxx = max(0,self.minx), min(1,self.maxx)
-        self.miny, self.maxy = max(0,self.miny), min(1,self.maxy)
-
-    def _handle_pinch(self, lm):
-        touching = dist(lm[4], lm[8]) < PINCH_THRESH
-        now = time.time()
-        if touching and self.pinch_t0 is None:
-            self.pinch_t0    = now
-            self.anchor_hand = self._map(lm[5].x, lm[5].y)
-            self.anchor_cur  = pyautogui.position()
-
-        if touching and not self.drag and now - self.pinch_t0 >= DRAG_DELAY:
-            pyautogui.mouseDown(); self.drag = True
-
-        if not touching:
-            if self.drag:
-                pyautogui.mouseUp(); self.drag = False
-            elif self.pinch_t0 and now - self.pinch_t0 < DRAG_DELAY:
-                pyautogui.click()
-            self.pinch_t0 = None
-
-    def _update_drag_raw(self, lm):
-        hx,hy = self._map(lm[5].x, lm[5].y)
-        dx,dy = hx-self.anchor_hand[0], hy-self.anchor_hand[1]
-        nx,ny = self.anchor_cur[0]+dx, self.anchor_cur[1]+dy
-        pyautogui.dragTo(nx, ny, duration=0, button='left', _pause=False)
-        self.kf.x[:2] = [nx, ny]
-
-    def _reset_pinch(self):
-        if self.drag: pyautogui.mouseUp(); self.drag=False
-        self.pinch_t0 = None
-
-    def _detect_scroll(self, lm):
-        idx   = lm[8].y  < lm[6].y
-        mid   = lm[12].y < lm[10].y
-        ring  = lm[16].y < lm[14].y
-        pink  = lm[20].y < lm[18].y
-        if idx and mid and not ring and not pink:
-            self.scroll_direction = "down"
-            self.target_scroll = -self.scroll_speed
-        elif idx and mid and ring and not pink:
-            self.scroll_direction = "up"
-            self.target_scroll = self.scroll_speed
-        else:
-            self.scroll_direction = None
-            self.target_scroll = 0
-
-    def _detect_gestures(self, landmarks):
-        """Detect various gestures and trigger corresponding actions"""
-        try:
-            # Pinch gesture (click and drag)
-            thumb_tip = landmarks[4]
-            index_tip = landmarks[8]
-            pinch_distance = np.sqrt((thumb_tip.x - index_tip.x)**2 + (thumb_tip.y - index_tip.y)**2)
-            
-            if pinch_distance < PINCH_THRESH:
-                now = time.time()
-                if now - self.last_click_time > self.click_cooldown:
-                    if not self.is_dragging:
-                        pyautogui.mouseDown()
-                        self.is_dragging = True
-                        self.drag_start_time = now
-                    self.last_click_time = now
-            else:
-                if self.is_dragging:
-                    pyautogui.mouseUp()
-                    self.is_dragging = False
-            
-            # Enter gesture (all fingers curled except thumb)
-            middle_tip = landmarks[12]
-            ring_tip = landmarks[16]
-            pinky_tip = landmarks[20]
-            
-            # More precise enter gesture detection
-            fingers_curled = all(tip.y > thumb_tip.y for tip in [index_tip, middle_tip, ring_tip, pinky_tip])
-            if fingers_curled:
-                now = time.time()
-                if now - self.enter_gesture_time > self.enter_gesture_cooldown:
-                    pyautogui.press('enter')
-                    self.enter_gesture_time = now
-            
-            # Scroll gestures with improved detection
-            index_up = index_tip.y < landmarks[6].y
-            middle_up = middle_tip.y < landmarks[10].y
-            ring_up = ring_tip.y < landmarks[14].y
-            pinky_up = pinky_tip.y < landmarks[18].y
-            
-            # Scroll down: index and middle up, others down
-            if index_up and middle_up and not ring_up and not pinky_up:
-                self.scroll_direction = "down"
-                self.target_scroll = -self.scroll_speed
-                pyautogui.scroll(-self.scroll_speed)  # Direct scroll
-            # Scroll up: index, middle, and ring up, pinky down
-            elif index_up and middle_up and ring_up and not pinky_up:
-                self.scroll_direction = "up"
-                self.target_scroll = self.scroll_speed
-                pyautogui.scroll(self.scroll_speed)  # Direct scroll
-            else:
-                self.scroll_direction = None
-                self.target_scroll = 0
-            
-            # Voice transcription gesture (pinky and thumb out, others curled)
-            pinky_out = pinky_tip.x > landmarks[19].x + 0.03
-            thumb_out = thumb_tip.x < landmarks[3].x - 0.03
-            index_cur = index_tip.y > landmarks[6].y
-            mid_cur = middle_tip.y > landmarks[10].y
-            ring_cur = ring_tip.y > landmarks[14].y
-            
-            if pinky_out and thumb_out and index_cur and mid_cur and ring_cur:
-                now = time.time()
-                if not self.speech_active and now - self.voice_search_time > self.voice_search_cooldown:
-                    pyautogui.hotkey('command', 'space')
-                    self.speech_active = True
-                    self.voice_search_time = now
-            else:
-                if self.speech_active:
-                    pyautogui.hotkey('command', 'space')
-                    self.speech_active = False
-                    
-        except Exception as e:
-            print(f"Error in gesture detection: {str(e)}")
-            traceback.print_exc()
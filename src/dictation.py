@@ -1,49 +1,110 @@
 #!/usr/bin/env python3
-import speech_recognition as sr
 import threading
 import time
-import pyautogui
-import queue
-import traceback
+import logging
+from collections import deque
+import numpy as np
+import platform
+import json
+import os
+
+try:
+    import pyperclip
+except ImportError:  # Fall back to typing dictated text key by key
+    pyperclip = None
+
+try:
+    from vosk import Model, KaldiRecognizer
+except ImportError:  # Fall back to Google's web recognizer
+    Model = KaldiRecognizer = None
+
+from .tracking import LandmarkFrame
+
+log = logging.getLogger(__name__)
+
+# speech_recognition (PortAudio) and pyautogui (platform input backend) are
+# heavy to import, so each is loaded the first time it is needed
+sr = None
+pyautogui = None
+
+def _sr():
+    global sr
+    if sr is None:
+        import speech_recognition as _s
+        sr = _s
+    return sr
+
+def _pg():
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as _p
+        pyautogui = _p
+    return pyautogui
 
 # ── tuning ────────────────────────────────────────────
 TOL          = 0.03   # curl / extend tolerance (unused here)
-MAX_SPEECH   = 10     # sec
 SPEECH_CD    = 2      # cooldown between dictations
+AUDIO_RING   = 16     # phrases buffered between the listener and the recognizer
+PHRASE_LIMIT = 2.0    # sec; continuous dictation hands audio over at least this often
+PASTE_MOD    = 'command' if platform.system() == 'Darwin' else 'ctrl'
+VOSK_MODEL   = "model-small-en"  # local Vosk model directory for offline recognition
+VOSK_RATE    = 16000
+
+# Thumb, index, middle, ring, pinky: fingertips and the joints they are compared to
+TIPS = np.array([4, 8, 12, 16, 20])
+PIPS = np.array([2, 6, 10, 14, 18])
+FINGER_BITS = 1 << np.arange(5)  # Thumb is bit 0, pinky bit 4
+
+# Gesture -> (fingers that must be extended, fingers that must be curled)
+GESTURE_MASKS = {
+    'speech': (0b10001, 0b01110),  # Thumb and pinky out, others curled
+    'closed': (0b00000, 0b11110),  # All fingers curled
+    'pinky':  (0b10000, 0b01111),  # Pinky only
+}
 
-def ext(lm, tip, pip):
-    return lm[tip].y < lm[pip].y - TOL
+def ext(ys):
+    return ys[TIPS] < ys[PIPS] - TOL
 
-def cur(lm, tip, pip):
-    return lm[tip].y > lm[pip].y + TOL
+def cur(ys):
+    return ys[TIPS] > ys[PIPS] + TOL
 
 class SpeechDictation:
     """Thumb+pinky = speech; closed hand = Enter; pinky-only = F3."""
     def __init__(self):
         print("Initializing speech dictation...")
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # Created on the first _ensure_listening, so speech_recognition and
+        # PortAudio are only loaded once dictation is actually used
+        self.recognizer = None
+        self.microphone = None
         self.is_listening = False
-        self.audio_queue = queue.Queue()
+        # Single-producer/single-consumer ring of recorded phrases. Only the
+        # producer moves _tail and only the consumer moves _head; each int
+        # store is atomic under the GIL, so no lock is needed
+        self._audio_ring = [None] * AUDIO_RING
+        self._head = 0
+        self._tail = 0
         self.processing_thread = None
+        self._stop_listening = None  # Stopper returned by listen_in_background
         self.adjust_for_ambient_noise = True
         self.state = "idle"
         self.stop_flag = False
         self.last_speech = 0
-        self.enter_t0 = None; self.last_enter = 0
-        self.f3_t0    = None; self.last_f3 = 0
-        
-        # Adjust recognizer settings for better performance
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.energy_threshold = 300  # Lower threshold for better sensitivity
-        self.recognizer.pause_threshold = 0.5  # Shorter pause threshold
-        self.recognizer.phrase_threshold = 0.3  # Shorter phrase threshold
-        self.recognizer.non_speaking_duration = 0.3  # Shorter non-speaking duration
-        
-        threading.Thread(target=self._process_audio, daemon=True).start()
+        # Hold-to-fire key gestures: hold time, cooldown, key, and timing state
+        self._holds = {
+            'closed': {'t0': None, 'last': 0, 'hold': 0.3, 'cd': 1.5, 'key': 'enter'},
+            'pinky':  {'t0': None, 'last': 0, 'hold': 0.2, 'cd': 2.0, 'key': 'f3'},
+        }
+
+        # Transcribe on-device when a Vosk model is available
+        self._vosk = None
+        if KaldiRecognizer is not None and os.path.isdir(VOSK_MODEL):
+            try:
+                self._vosk = KaldiRecognizer(Model(VOSK_MODEL), VOSK_RATE)
+            except Exception as e:
+                print(f"Could not load Vosk model: {str(e)}")
         
         # Performance optimization
-        self.gesture_history = []
+        self.gesture_history = deque(maxlen=3)
         self.last_gesture_time = 0
         self.gesture_cooldown = 0.3  # Reduced cooldown for faster response
         
@@ -53,61 +114,127 @@ class SpeechDictation:
         """Start dictation in a separate thread."""
         if not self.is_listening:
             self.is_listening = True
-            self.processing_thread = threading.Thread(target=self._process_audio, daemon=True)
-            self.processing_thread.start()
-            
-            # Start listening in a separate thread
-            threading.Thread(target=self._listen_loop, daemon=True).start()
+            self._ensure_listening()
             
     def stop(self):
         """Stop dictation."""
         self.is_listening = False
+        if self._stop_listening:
+            self._stop_listening(wait_for_stop=False)
+            self._stop_listening = None
         if self.processing_thread:
             self.processing_thread.join(timeout=1.0)
             
-    def _listen_loop(self):
-        """Continuously listen for audio input."""
+    def _push_audio(self, audio):
+        """Hand a phrase to the recognizer; dropped if the ring is full."""
+        if self._tail - self._head >= AUDIO_RING:
+            log.debug("Audio buffer full, dropping phrase")
+            return
+        self._audio_ring[self._tail % AUDIO_RING] = audio
+        self._tail += 1
+
+    def _pop_audio(self):
+        """Next recorded phrase, or None when the ring is empty."""
+        if self._head == self._tail:
+            return None
+        i = self._head % AUDIO_RING
+        audio = self._audio_ring[i]
+        self._audio_ring[i] = None
+        self._head += 1
+        return audio
+
+    def _ensure_listening(self):
+        """Open the microphone stream and recognizer thread once; they stay up until stop()."""
+        if self._stop_listening is None:
+            self._start_listening()
+        if self._stop_listening is not None and not (
+                self.processing_thread and self.processing_thread.is_alive()):
+            self.processing_thread = threading.Thread(target=self._process_audio, daemon=True)
+            self.processing_thread.start()
+
+    def _open_audio(self):
+        """Create the recognizer and microphone on first use."""
+        self.recognizer = _sr().Recognizer()
+        # Adjust recognizer settings for better performance
+        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.energy_threshold = 300  # Lower threshold for better sensitivity
+        self.recognizer.pause_threshold = 0.5  # Shorter pause threshold
+        self.recognizer.phrase_threshold = 0.3  # Shorter phrase threshold
+        self.recognizer.non_speaking_duration = 0.3  # Shorter non-speaking duration
+        self.microphone = _sr().Microphone()
+
+    def _start_listening(self):
+        """Record phrases on speech_recognition's background listener thread."""
         try:
-            with self.microphone as source:
-                if self.adjust_for_ambient_noise:
+            if self.microphone is None:
+                self._open_audio()
+            if self.adjust_for_ambient_noise:
+                with self.microphone as source:
                     self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                    self.adjust_for_ambient_noise = False
-                
-                while self.is_listening:
-                    try:
-                        audio = self.recognizer.listen(source, timeout=1.0, phrase_time_limit=5.0)
-                        self.audio_queue.put(audio)
-                    except sr.WaitTimeoutError:
-                        continue
-                    except Exception as e:
-                        print(f"Error in listen loop: {str(e)}")
-                        time.sleep(0.1)
+                self.adjust_for_ambient_noise = False
+            self._stop_listening = self.recognizer.listen_in_background(
+                self.microphone, self._on_audio_chunk, phrase_time_limit=PHRASE_LIMIT)
         except Exception as e:
             print(f"Error in microphone setup: {str(e)}")
-            
+
+    def _on_audio_chunk(self, recognizer, audio):
+        """Background listener callback: queue each phrase as soon as it ends.
+
+        Phrases are kept while dictation runs or the speech gesture is held.
+        """
+        if self.is_listening or (self.state == "recording" and not self.stop_flag):
+            self._push_audio(audio)
+
+    @staticmethod
+    def _type_text(text):
+        """Insert text at the cursor with one clipboard paste instead of a keystroke per character."""
+        if pyperclip is None:
+            _pg().typewrite(text)
+            return
+        pyperclip.copy(text)
+        _pg().hotkey(PASTE_MOD, 'v')
+
+    def _recognize(self, audio):
+        """Transcribe one phrase, locally with Vosk when loaded, otherwise via Google."""
+        if self._vosk is None:
+            return self.recognizer.recognize_google(audio)
+        self._vosk.AcceptWaveform(audio.get_raw_data(convert_rate=VOSK_RATE, convert_width=2))
+        return json.loads(self._vosk.FinalResult())['text']
+
     def _process_audio(self):
-        """Process audio from the queue."""
-        while self.is_listening:
+        """Process audio from the ring."""
+        while self._stop_listening is not None:
             try:
-                audio = self.audio_queue.get(timeout=1.0)
+                audio = self._pop_audio()
+                if audio is None:
+                    time.sleep(0.01)
+                    continue
                 try:
-                    text = self.recognizer.recognize_google(audio)
+                    text = self._recognize(audio)
                     if text:
                         print(f"Dictated: {text}")
-                        # Type out the text
-                        pyautogui.typewrite(text + " ")
-                except sr.UnknownValueError:
+                        self._type_text(text + " ")
+                except _sr().UnknownValueError:
                     pass  # Ignore unrecognized speech
-                except sr.RequestError as e:
-                    print(f"Could not request results: {str(e)}")
+                except _sr().RequestError as e:
+                    log.warning("Could not request results: %s", e)
                 except Exception as e:
-                    print(f"Error processing audio: {str(e)}")
-            except queue.Empty:
-                continue
+                    log.debug("Error processing audio: %s", e)
             except Exception as e:
-                print(f"Error in processing loop: {str(e)}")
+                log.warning("Error in processing loop: %s", e)
                 time.sleep(0.1)
 
+    def _poll_hold(self, name, active, now):
+        """Press the gesture's key once it has been held long enough, then cool down."""
+        h = self._holds[name]
+        if not active:
+            h['t0'] = None
+            return
+        if h['t0'] is None: h['t0'] = now
+        if now - h['t0'] >= h['hold'] and now - h['last'] > h['cd']:
+            _pg().press(h['key'])
+            h['last'] = now; h['t0'] = None
+
     def update(self, landmarks):
         """Update dictation state based on hand landmarks"""
         if landmarks is None:
@@ -115,15 +242,12 @@ class SpeechDictation:
             
         try:
             now = time.time()
-            t_ext = ext(landmarks,4,2); t_cur = cur(landmarks,4,2)
-            idx_ext = ext(landmarks,8,6); idx_cur = cur(landmarks,8,6)
-            mid_ext = ext(landmarks,12,10); mid_cur = cur(landmarks,12,10)
-            ring_ext= ext(landmarks,16,14); ring_cur= cur(landmarks,16,14)
-            pink_ext= ext(landmarks,20,18); pink_cur= cur(landmarks,20,18)
-
-            speech_g = t_ext and pink_ext and idx_cur and mid_cur and ring_cur
-            closed_g = idx_cur and mid_cur and ring_cur and pink_cur
-            pinky_g  = pink_ext and t_cur and idx_cur and mid_cur and ring_cur
+            ys = LandmarkFrame.from_landmarks(landmarks).ys
+            ext_bits = int(ext(ys) @ FINGER_BITS)
+            cur_bits = int(cur(ys) @ FINGER_BITS)
+            g = {name: (ext_bits & e) == e and (cur_bits & c) == c
+                 for name, (e, c) in GESTURE_MASKS.items()}
+            speech_g, closed_g, pinky_g = g['speech'], g['closed'], g['pinky']
 
             if speech_g and self.state=="idle" and now-self.last_speech>SPEECH_CD:
                 self.state="recording"; self.stop_flag=False
@@ -133,29 +257,13 @@ class SpeechDictation:
                 self.state="idle"
                 self.last_speech=now
 
-            # ENTER
-            if closed_g:
-                if self.enter_t0 is None: self.enter_t0=now
-                if now-self.enter_t0>=0.3 and now-self.last_enter>1.5:
-                    pyautogui.press("enter")
-                    self.last_enter=now; self.enter_t0=None
-            else:
-                self.enter_t0=None
-
-            # F3
-            if pinky_g:
-                if self.f3_t0 is None: self.f3_t0=now
-                if now-self.f3_t0>=0.2 and now-self.last_f3>2.0:
-                    pyautogui.press("f3")
-                    self.last_f3=now; self.f3_t0=None
-            else:
-                self.f3_t0=None
+            # ENTER and F3
+            self._poll_hold('closed', closed_g, now)
+            self._poll_hold('pinky', pinky_g, now)
 
             # Update gesture history
             if now - self.last_gesture_time >= self.gesture_cooldown:
                 self.gesture_history.append(speech_g)
-                if len(self.gesture_history) > 3:
-                    self.gesture_history.pop(0)
                 
                 # Check for consistent gesture
                 if len(self.gesture_history) >= 2:
@@ -167,11 +275,10 @@ class SpeechDictation:
                 self.last_gesture_time = now
                 
         except Exception as e:
-            print(f"Error in dictation update: {str(e)}")
-            traceback.print_exc()
+            log.debug("Error in dictation update: %s", e, exc_info=True)
             
     def _record(self):
-        with self.microphone as m:
-            audio = self.recognizer.listen(m, phrase_time_limit=MAX_SPEECH)
-            if not self.stop_flag:
-                self.audio_queue.put(audio)
+        # Gesture recordings come through the same long-lived background
+        # stream as dictation: the callback keeps phrases while the gesture
+        # is held, so the microphone isn't reopened on every gesture
+        self._ensure_listening()
@@ -0,0 +1,74 @@
+"""Per-frame numeric gesture work for the GUI, compiled with numba when available."""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Run process_landmarks as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+PINCH_THRESHOLD = 0.05  # Reduced from 0.1 for more precise clicking
+PINCH_SQ = PINCH_THRESHOLD * PINCH_THRESHOLD  # Compared against squared distances
+BOX_GROW = 0.08  # How fast the box expands
+BOX_DECAY = 0.001  # How fast the box shrinks
+CURSOR_IDX = 14  # Middle knuckle drives the cursor
+
+# Thumb, index, middle, ring, pinky: fingertips and the joints they are compared to
+TIPS = np.array([4, 8, 12, 16, 20])
+PIPS = np.array([2, 6, 10, 14, 18])
+
+# Slots of the float32 box array: the dynamic bounding box of the cursor point
+MIN_X, MAX_X, MIN_Y, MAX_Y = range(4)
+
+@njit(cache=True)
+def _lut(table, v):
+    """Linearly interpolate table, sampled evenly over [0, 1], at v (clamped)."""
+    top = table.shape[0] - 1
+    f = min(max(v * top, 0.0), float(top))
+    i = min(int(f), top - 1)
+    return table[i] + (f - i) * (table[i + 1] - table[i])
+
+@njit(cache=True)
+def process_landmarks(pts, box, x_lut, y_lut):
+    """Numeric part of one frame for (21, 2) landmarks.
+
+    Updates box in place and maps the cursor point through the x/y screen
+    lookup tables. Returns (target_x, target_y, extended, pinch) where
+    extended has one bit per extended finger, thumb = 0b10000.
+    """
+    # Extended fingers packed into 5 bits, thumb highest
+    extended = 0
+    for i in range(5):
+        extended <<= 1
+        if pts[TIPS[i], 1] < pts[PIPS[i], 1]:
+            extended |= 1
+
+    # Pointer and thumb touching
+    dx = pts[8, 0] - pts[4, 0]
+    dy = pts[8, 1] - pts[4, 1]
+    pinch = dx * dx + dy * dy < PINCH_SQ
+
+    x = pts[CURSOR_IDX, 0]
+    y = pts[CURSOR_IDX, 1]
+
+    # Expand the dynamic bounding box if the hand moves outside
+    if x < box[MIN_X]:
+        box[MIN_X] -= BOX_GROW * (box[MIN_X] - x)
+    if x > box[MAX_X]:
+        box[MAX_X] += BOX_GROW * (x - box[MAX_X])
+    if y < box[MIN_Y]:
+        box[MIN_Y] -= BOX_GROW * (box[MIN_Y] - y)
+    if y > box[MAX_Y]:
+        box[MAX_Y] += BOX_GROW * (y - box[MAX_Y])
+
+    # Slowly shrink the box when the hand stays inside
+    box[MIN_X] = max(0.0, box[MIN_X] + BOX_DECAY)
+    box[MAX_X] = min(1.0, box[MAX_X] - BOX_DECAY)
+    box[MIN_Y] = max(0.0, box[MIN_Y] + BOX_DECAY)
+    box[MAX_Y] = min(1.0, box[MAX_Y] - BOX_DECAY)
+
+    # Stretch-band mapping to screen pixels, tabulated per axis and
+    # interpolated between entries so the cursor still moves pixel by pixel
+    return _lut(x_lut, x), _lut(y_lut, y), extended, pinch
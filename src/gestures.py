@@ -1,13 +1,35 @@
 """Map hand landmarks to OS mouse / gesture actions."""
-import math
 import time
 import threading
+import logging
 from typing import List, Tuple
-import pyautogui
-
-# Disable pyautogui delays
-pyautogui.PAUSE = 0
-pyautogui.FAILSAFE = False
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Run _classify as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+from .tracking import LandmarkFrame
+
+log = logging.getLogger(__name__)
+
+# pyautogui loads the platform input backend on import, so it is only
+# imported the first time an action actually needs it
+pyautogui = None
+
+def _pg():
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as _p
+        # Disable pyautogui delays
+        _p.PAUSE = 0
+        _p.FAILSAFE = False
+        pyautogui = _p
+    return pyautogui
 
 # Landmarks indices
 THUMB_TIP = 4
@@ -17,6 +39,41 @@ MIDDLE_KNUCKLE = 14  # Changed to middle knuckle for cursor
 RING_TIP = 16
 PINKY_TIP = 20
 
+PINCH_DIST = 0.1                # Pointer-thumb distance that counts as a pinch
+PINCH_SQ = PINCH_DIST * PINCH_DIST  # Compared against squared distances
+
+GESTURE_EVERY = 2      # Classify gestures on every Nth frame; the cursor updates every frame
+MAX_MISSED_FRAMES = 5  # Frames to coast on the last landmarks before recentring the cursor
+
+@njit(cache=True, fastmath=True)
+def _classify(xs, ys):
+    """Per-frame gesture flags from the landmark x/y arrays.
+
+    Returns (pinch, enter, scroll_dir, dictation) where
+    scroll_dir is 1 (up), -1 (down) or 0.
+    """
+    thumb_ext = ys[THUMB_TIP] < ys[THUMB_TIP - 2]
+    index_ext = ys[INDEX_TIP] < ys[INDEX_TIP - 2]
+    middle_ext = ys[MIDDLE_TIP] < ys[MIDDLE_TIP - 2]
+    ring_ext = ys[RING_TIP] < ys[RING_TIP - 2]
+    pinky_ext = ys[PINKY_TIP] < ys[PINKY_TIP - 2]
+
+    dx = xs[INDEX_TIP] - xs[THUMB_TIP]
+    dy = ys[INDEX_TIP] - ys[THUMB_TIP]
+    pinch = dx * dx + dy * dy < PINCH_SQ
+
+    # Enter: only thumb extended
+    enter = thumb_ext and not index_ext and not middle_ext and not ring_ext and not pinky_ext
+
+    # Scroll: pointer and middle extended (down) or pointer+middle+ring (up)
+    scroll_dir = 0
+    if index_ext and middle_ext and not pinky_ext:
+        scroll_dir = 1 if ring_ext else -1
+
+    # Dictation: thumb and pinky extended, others curled
+    dictation = pinky_ext and thumb_ext and not index_ext and not middle_ext and not ring_ext
+    return pinch, enter, scroll_dir, dictation
+
 class GestureController:
     def __init__(self):
         self.click_state = False
@@ -24,7 +81,11 @@ class GestureController:
         self.scroll_state = False
         self.drag_state = False
         self.dictation_state = False
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.screen_width, self.screen_height = _pg().size()
+        # x is mirrored, so screen_x = (1 - x) * w folds into x * -w + w
+        self._x_scale = -self.screen_width
+        self._x_offset = self.screen_width
+        self._y_scale = self.screen_height
         
         # Drag control
         self.pinch_start_time = 0
@@ -35,95 +96,100 @@ class GestureController:
         self.scroll_speed = 0.005  # Faster updates for smoother scrolling
         
         # Cursor smoothing
-        self.last_x = None
-        self.last_y = None
+        self.last_x = 0.5  # Start at the centre so smoothing needs no first-frame case
+        self.last_y = 0.5
         self.alpha = 0.65  # Smoothing factor (0.5-0.7 is sweet spot)
 
+        # Whether a hand has been seen; while it briefly drops out the cursor
+        # coasts on last_x/last_y
+        self._has_hand = False
+        self._miss_count = 0
+        self._frame_i = 0
+
+        # Compile _classify now rather than on the first real frame
+        _classify(np.zeros(21, dtype=np.float32), np.zeros(21, dtype=np.float32))
+
     def _smooth_position(self, x: float, y: float) -> Tuple[float, float]:
         """Apply exponential moving average smoothing."""
-        if self.last_x is None:
-            self.last_x, self.last_y = x, y
-            return x, y
-            
         smooth_x = self.alpha * x + (1 - self.alpha) * self.last_x
         smooth_y = self.alpha * y + (1 - self.alpha) * self.last_y
         self.last_x, self.last_y = smooth_x, smooth_y
         return smooth_x, smooth_y
 
     @staticmethod
-    def _distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-
-    @staticmethod
-    def _is_extended(tip: Tuple[float, float], pip: Tuple[float, float]) -> bool:
-        return tip[1] < pip[1]
-
-    def _get_landmark(self, landmarks, idx: int) -> Tuple[float, float]:
-        if not landmarks or idx >= len(landmarks):
-            return (0.0, 0.0)
-        return (landmarks[idx].x, landmarks[idx].y)
+    def _get_xy(frame: LandmarkFrame, idx: int) -> Tuple[float, float]:
+        return frame.xs.item(idx), frame.ys.item(idx)
 
     def _to_screen_coords(self, x: float, y: float) -> Tuple[int, int]:
         """Convert normalized coordinates (0-1) to screen coordinates, with horizontal inversion."""
-        screen_x = int((1.0 - x) * self.screen_width)  # Invert x coordinate
-        screen_y = int(y * self.screen_height)
-        return screen_x, screen_y
+        return int(x * self._x_scale + self._x_offset), int(y * self._y_scale)
+
+    def _is_pinching(self, frame: LandmarkFrame) -> bool:
+        """Pointer-thumb pinch test alone, without classifying the rest of the hand."""
+        ix, iy = self._get_xy(frame, INDEX_TIP)
+        tx, ty = self._get_xy(frame, THUMB_TIP)
+        return (ix - tx) ** 2 + (iy - ty) ** 2 < PINCH_SQ
+
+    def _release_pinch(self):
+        """Reset click/drag state for an open pinch, letting go of a drag."""
+        self.click_state = False
+        if self.drag_state:
+            _pg().mouseUp()
+            self.drag_state = False
+        self.pinch_start_time = 0
 
     def process(self, landmarks):
         """Given 21 landmark points, execute gestures & return cursor point."""
         if not landmarks or len(landmarks) < 21:
+            # Hold the cursor on the last known hand position for a few
+            # frames instead of snapping it to the centre
+            self._miss_count += 1
+            if self._has_hand and self._miss_count <= MAX_MISSED_FRAMES:
+                return self._to_screen_coords(self.last_x, self.last_y)
             return self._to_screen_coords(0.5, 0.5)
+        self._has_hand = True
+        self._miss_count = 0
 
         try:
+            frame = LandmarkFrame.from_landmarks(landmarks)
+
             # Get cursor point from middle knuckle and smooth it
-            cursor_pt = self._get_landmark(landmarks, MIDDLE_KNUCKLE)
-            smooth_x, smooth_y = self._smooth_position(*cursor_pt)
+            cursor_x, cursor_y = self._get_xy(frame, MIDDLE_KNUCKLE)
+            smooth_x, smooth_y = self._smooth_position(cursor_x, cursor_y)
+
+            # Hand poses change far slower than the camera rate, so classify
+            # every GESTURE_EVERY frames; a pinch release is still handled on
+            # every frame so the mouse button never stays held an extra frame
+            self._frame_i += 1
+            if self._frame_i % GESTURE_EVERY:
+                if not self._is_pinching(frame):
+                    self._release_pinch()
+                return self._to_screen_coords(smooth_x, smooth_y)
             
-            # Get all needed landmark points
-            thumb_tip = self._get_landmark(landmarks, THUMB_TIP)
-            index_tip = self._get_landmark(landmarks, INDEX_TIP)
-            middle_tip = self._get_landmark(landmarks, MIDDLE_TIP)
-            ring_tip = self._get_landmark(landmarks, RING_TIP)
-            pinky_tip = self._get_landmark(landmarks, PINKY_TIP)
-            
-            # Get PIP joints for extension check
-            index_pip = self._get_landmark(landmarks, INDEX_TIP - 2)
-            middle_pip = self._get_landmark(landmarks, MIDDLE_TIP - 2)
-            ring_pip = self._get_landmark(landmarks, RING_TIP - 2)
-            pinky_pip = self._get_landmark(landmarks, PINKY_TIP - 2)
-            thumb_pip = self._get_landmark(landmarks, THUMB_TIP - 2)
+            pinch, enter, scroll_dir, dictation_gesture = _classify(frame.xs, frame.ys)
 
             # Left click: pointer and thumb touch
-            if self._distance(index_tip, thumb_tip) < 0.1:
+            if pinch:
                 if not self.click_state:
-                    pyautogui.click()
+                    _pg().click()
                     self.click_state = True
             else:
                 self.click_state = False
 
             # Enter: only thumb extended
-            if (self._is_extended(thumb_tip, thumb_pip) and
-                not self._is_extended(index_tip, index_pip) and
-                not self._is_extended(middle_tip, middle_pip) and
-                not self._is_extended(ring_tip, ring_pip) and
-                not self._is_extended(pinky_tip, pinky_pip)):
+            if enter:
                 if not self.enter_state:
-                    pyautogui.press('enter')
+                    _pg().press('enter')
                     self.enter_state = True
             else:
                 self.enter_state = False
 
             # Scroll: pointer and middle extended (down) or pointer+middle+ring (up)
-            if (self._is_extended(index_tip, index_pip) and
-                self._is_extended(middle_tip, middle_pip) and
-                not self._is_extended(pinky_tip, pinky_pip)):
+            if scroll_dir:
                 
                 current_time = time.time()
                 if current_time - self.last_scroll_time >= self.scroll_speed:
-                    if self._is_extended(ring_tip, ring_pip):  # Scroll up
-                        pyautogui.scroll(2)  # Increased scroll amount
-                    else:  # Scroll down
-                        pyautogui.scroll(-2)  # Increased scroll amount
+                    _pg().scroll(2 * scroll_dir)  # Increased scroll amount
                     self.last_scroll_time = current_time
                 
                 if not self.scroll_state:
@@ -132,27 +198,21 @@ class GestureController:
                 self.scroll_state = False
 
             # Drag: pointer and thumb pinch held for threshold time
-            if self._distance(index_tip, thumb_tip) < 0.1:
+            if pinch:
                 current_time = time.time()
                 if not self.drag_state:
                     if self.pinch_start_time == 0:
                         self.pinch_start_time = current_time
                     elif current_time - self.pinch_start_time >= self.pinch_threshold:
-                        pyautogui.mouseDown()
+                        _pg().mouseDown()
                         self.drag_state = True
             else:
                 if self.drag_state:
-                    pyautogui.mouseUp()
+                    _pg().mouseUp()
                     self.drag_state = False
                 self.pinch_start_time = 0
 
             # Dictation mode: trigger on gesture release
-            dictation_gesture = (self._is_extended(pinky_tip, pinky_pip) and
-                               self._is_extended(thumb_tip, thumb_pip) and
-                               not self._is_extended(index_tip, index_pip) and
-                               not self._is_extended(middle_tip, middle_pip) and
-                               not self._is_extended(ring_tip, ring_pip))
-            
             if dictation_gesture:
                 self.dictation_state = True
             elif self.dictation_state:  # Gesture was released
@@ -161,11 +221,11 @@ class GestureController:
                     if not SpeechDictation.active():
                         threading.Thread(target=SpeechDictation.start, daemon=True).start()
                 except Exception as e:
-                    print(f"Dictation error: {str(e)}")
+                    log.warning("Dictation error: %s", e)
                 self.dictation_state = False
 
         except Exception as e:
-            print(f"Error in gesture processing: {str(e)}")
+            log.debug("Error in gesture processing: %s", e)
             return self._to_screen_coords(0.5, 0.5)
 
         return self._to_screen_coords(smooth_x, smooth_y) 
\ No newline at end of file
@@ -6,18 +6,38 @@ import sys
 import cv2
 import mediapipe as mp
 import numpy as np
-import pyautogui
 import time
 import os
 from dotenv import load_dotenv
-import speech_recognition as sr
 import threading
+import queue
 from collections import deque
 import math
+import logging
+from types import SimpleNamespace
+from mediapipe.framework.formats import landmark_pb2
 
-from .tracking import HandTracker
-from .smoothing import EMASmoother, KalmanSmoother
+try:
+    from tflite_runtime.interpreter import Interpreter, load_delegate
+except ImportError:  # Track with MediaPipe's graph only
+    Interpreter = load_delegate = None
+
+from .smoothing import KalmanSmoother
 from .dictation import SpeechDictation
+from .gesture_kernel import process_landmarks
+
+log = logging.getLogger(__name__)
+
+# pyautogui (platform input backend) is heavy to import, so it is loaded
+# when the window is built rather than when this module is imported
+pyautogui = None
+
+def _pg():
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as _p
+        pyautogui = _p
+    return pyautogui
 
 # Load environment variables
 load_dotenv()
@@ -30,16 +50,26 @@ UI_WIDTH = int(os.getenv('UI_WIDTH', 1280))
 UI_HEIGHT = int(os.getenv('UI_HEIGHT', 720))
 UI_TITLE = os.getenv('UI_TITLE', 'Hand Control System')
 UI_FPS = int(os.getenv('UI_FPS', 30))
+LANDMARK_MODEL = os.getenv('LANDMARK_MODEL', 'hand_landmark_lite.tflite')
+XNNPACK_LIB = os.getenv('XNNPACK_LIB', 'libXNNPACK.so')
 
 # Drag smoothing settings
 SMOOTH_WINDOW = 6  # Number of deltas to average
-SMOOTH_ALPHA = 0.65  # Smoothing factor (0.5-0.7 is sweet spot)
-PINCH_THRESHOLD = 0.05  # Reduced from 0.1 for more precise clicking
+CURSOR_KALMAN_R = 0.08  # Cursor filter measurement noise; higher = smoother, more lag
 DRAG_DELAY = 0.3  # Seconds to hold pinch before drag starts
 SCROLL_SPEED = 0.1  # Slower scrolling
 SCROLL_AMOUNT = 3  # Scroll amount
-BOX_GROW = 0.08  # How fast the box expands
-BOX_DECAY = 0.001  # How fast the box shrinks
+# Extended-finger masks, thumb = 0b10000 ... pinky = 0b00001
+ENTER_MASK = 0b10000      # Only thumb extended
+DICTATION_MASK = 0b10001  # Thumb and pinky extended
+SCROLL_MASK = 0b01101     # Fingers that decide scrolling (thumb and ring are free)
+SCROLL_BITS = 0b01100     # ...pointer and middle extended, pinky not
+SCROLL_UP_BIT = 0b00010   # Ring extended scrolls up, otherwise down
+MAP_LUT_SIZE = 1024  # Entries per axis in the hand-to-screen lookup tables
+INFER_SIZE = (320, 180)  # Full-frame hand search runs at this size; the model input is smaller still
+ROI_PAD = 0.25  # Grow the last hand box by this fraction on each side before cropping
+LANDMARK_INPUT = 224  # Side of the square crop the landmark model expects
+LANDMARK_MIN_SCORE = 0.5  # Below this hand-presence score, go back to full-frame detection
 
 class SimpleGUI(QMainWindow):
     def __init__(self):
@@ -82,6 +112,7 @@ class SimpleGUI(QMainWindow):
         self.display = QLabel()
         self.display.setAlignment(Qt.AlignCenter)
         self.display.setMinimumSize(640, 480)
+        self.display.setScaledContents(True)  # Qt scales the pixmap when painting
         self.display.setStyleSheet("""
             QLabel {
                 background-color: #1E1E1E;
@@ -128,6 +159,10 @@ class SimpleGUI(QMainWindow):
             model_complexity=0  # Use lite model for better performance
         )
         
+        # Landmark model run directly on the tracked hand crop, if available;
+        # mp_hands then only runs to find the hand again
+        self._landmark_net = self._load_landmark_model()
+        
         # Initialize camera
         print("Initializing camera...")
         self.cap = cv2.VideoCapture(CAMERA_ID)
@@ -139,17 +174,47 @@ class SimpleGUI(QMainWindow):
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
         self.cap.set(cv2.CAP_PROP_FPS, 30)
-        
-        # Initialize hand tracker
-        self.tracker = HandTracker(camera=CAMERA_ID, max_hands=1, draw=True)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't queue stale frames in the driver
+        
+        # Capture on its own thread so update_frame always gets the newest
+        # frame instead of waiting on the camera
+        self._frame_lock = threading.Lock()
+        self._latest = None
+        self._capturing = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        
+        # Send OS input events from their own thread so a slow event API
+        # never holds up the frame loop
+        pg = _pg()
+        self._actions = {
+            'move': lambda x, y: pg.moveTo(x, y, _pause=False),
+            'drag': lambda x, y: pg.dragTo(x, y, duration=0.01, button='left'),
+            'click': pg.click,
+            'press': pg.press,
+            'scroll': pg.scroll,
+            'down': pg.mouseDown,
+            'up': pg.mouseUp,
+        }
+        self._action_q = queue.Queue()  # Unbounded: discrete events are never dropped
+        self._move_lock = threading.Lock()
+        self._move_cell = None  # [cmd] of the queued move still taking newer positions
+        self._action_thread = threading.Thread(target=self._action_loop, daemon=True)
+        self._action_thread.start()
         
         # Initialize smoothers
-        self.position_smoother = EMASmoother(alpha=SMOOTH_ALPHA)
-        self.kalman_smoother = KalmanSmoother()
+        self.kalman_smoother = KalmanSmoother(r=CURSOR_KALMAN_R)
         
         # Initialize speech dictation
         self.dictation = SpeechDictation()
         
+        # One long-lived thread runs dictation start/stop, which can block
+        # on the microphone; the newest command wins
+        self._dict_cmd = None
+        self._dict_cmd_event = threading.Event()
+        self._dict_thread = threading.Thread(target=self._dict_loop, daemon=True)
+        self._dict_thread.start()
+        
         # Initialize gesture states
         self.click_state = False
         self.enter_state = False
@@ -159,16 +224,35 @@ class SimpleGUI(QMainWindow):
         
         # Initialize drag control
         self.pinch_start_time = 0
-        self.drag_buf = deque(maxlen=SMOOTH_WINDOW)
+        # Ring buffer of recent drag targets: one (x, y) row per frame
+        self._drag_buf = np.zeros((SMOOTH_WINDOW, 2), np.float32)
+        self._drag_idx = 0
+        self._drag_len = 0
         self.anchor_hand = (0, 0)
         self.anchor_cur = (0, 0)
         
         # Initialize scroll control
         self.last_scroll_time = time.time()
         
+        # Screen size doesn't change while running, and the cursor only moves
+        # where we send it, so neither needs asking the OS every frame
+        self._screen_w, self._screen_h = pg.size()
+        self._last_set_cursor = pg.position()
+        
+        # Hand-to-screen mapping, tabulated once for this screen size
+        self._build_screen_luts()
+        
+        # Stretch-band overlay segments, rebuilt only if the frame size changes
+        self._build_band_lines(CAMERA_WIDTH, CAMERA_HEIGHT)
+        
+        # Pixel box (x0, y0, x1, y1) around the last detected hand; None = search the full frame
+        self._prev_bbox = None
+        
         # Initialize dynamic bounding box
-        self.min_x, self.max_x = 0.0, 1.0
-        self.min_y, self.max_y = 0.0, 1.0
+        self._box = np.array([0.0, 1.0, 0.0, 1.0], np.float32)  # min_x, max_x, min_y, max_y
+        
+        # Compile process_landmarks now rather than on the first hand frame
+        process_landmarks(np.zeros((21, 2), np.float32), self._box.copy(), self._x_lut, self._y_lut)
         
         # Setup timer for frame updates
         self.timer = QTimer()
@@ -195,157 +279,301 @@ class SimpleGUI(QMainWindow):
             self.stop_button.setEnabled(False)
             self.status_label.setText("Tracking stopped")
             
+    def _capture_loop(self):
+        """Keep the latest camera frame in a single slot, dropping older ones."""
+        while self._capturing:
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            ret, frame = self.cap.retrieve()
+            if ret:
+                with self._frame_lock:
+                    self._latest = frame
+                    
+    def _post(self, name, *args):
+        """Queue an input event for the action thread.
+
+        Moves and drags share one queued slot that later positions overwrite
+        until it is sent, so they can't pile up; any other event seals that
+        slot first, keeping it ordered behind the move it followed.
+        """
+        cmd = (name,) + args
+        with self._move_lock:
+            if name in ('move', 'drag'):
+                if self._move_cell is not None:
+                    self._move_cell[0] = cmd  # Newest position wins
+                    return
+                self._move_cell = [cmd]
+                cmd = ('cell', self._move_cell)
+            else:
+                self._move_cell = None
+        self._action_q.put(cmd)
+            
+    def _action_loop(self):
+        """Send queued input events in order."""
+        while True:
+            cmd = self._action_q.get()
+            if cmd[0] == 'stop':
+                return
+            if cmd[0] == 'cell':
+                cell = cmd[1]
+                with self._move_lock:
+                    cmd = cell[0]
+                    if self._move_cell is cell:
+                        self._move_cell = None  # Later moves need a new slot
+            try:
+                self._actions[cmd[0]](*cmd[1:])
+            except Exception as e:
+                log.warning("Input event %s failed: %s", cmd[0], e)
+                
+    def _dictation_cmd(self, cmd):
+        """Ask the dictation thread to 'start' or 'stop'."""
+        self._dict_cmd = cmd
+        self._dict_cmd_event.set()
+        
+    def _dict_loop(self):
+        """Run dictation start/stop commands off the GUI thread."""
+        while True:
+            self._dict_cmd_event.wait()
+            self._dict_cmd_event.clear()
+            cmd, self._dict_cmd = self._dict_cmd, None
+            try:
+                if cmd == 'start':
+                    self.dictation.start()
+                elif cmd == 'stop':
+                    self.dictation.stop()
+            except Exception as e:
+                log.warning("Dictation %s failed: %s", cmd, e)
+                
+    def _take_frame(self):
+        """Pop the newest captured frame, or None if none arrived since the last call."""
+        with self._frame_lock:
+            frame, self._latest = self._latest, None
+        return frame
+            
+    def _build_band_lines(self, w: int, h: int):
+        """Precompute the stretch-band overlay as line segments for cv2.polylines."""
+        band_top = int(0.05 * h)
+        band_bottom = int(0.60 * h)  # Changed to 60%
+        band_left = int(0.05 * w)
+        band_right = int(0.95 * w)
+        
+        # Band thresholds: horizontal, then vertical
+        bands = [((0, band_top), (w, band_top)), ((0, band_bottom), (w, band_bottom)),
+                 ((band_left, 0), (band_left, h)), ((band_right, 0), (band_right, h))]
+        
+        # Stretch areas, one segment every 5 px
+        stretch = []
+        # Bottom stretch (increased area and strength)
+        for i in range(band_bottom, h, 5):
+            y_norm = float(i) / h
+            if y_norm > 0.60:
+                extra = (y_norm - 0.60) / 0.40
+                stretch.append(((0, i), (int((0.60 + extra * 0.8) * w), i)))
+        # Top stretch (weakened)
+        for i in range(0, band_top, 5):
+            extra = (0.05 - float(i) / h) / 0.05
+            stretch.append(((0, i), (int((0.05 - extra * 0.2) * w), i)))  # reduced to +20%
+        # Right stretch (weakened)
+        for i in range(band_right, w, 5):
+            x_norm = float(i) / w
+            if x_norm > 0.95:
+                extra = (x_norm - 0.95) / 0.05
+                stretch.append(((i, 0), (i, int((0.95 + extra * 0.2) * h))))  # reduced to +20%
+        # Left stretch (weakened)
+        for i in range(0, band_left, 5):
+            extra = (0.05 - float(i) / w) / 0.05
+            stretch.append(((i, 0), (i, int((0.05 - extra * 0.2) * h))))  # reduced to +20%
+        
+        self._band_lines = list(np.array(bands, dtype=np.int32))
+        self._stretch_lines = list(np.array(stretch, dtype=np.int32).reshape(-1, 2, 2))
+        self._band_size = (w, h)
+        
+    def _update_roi(self, hand_landmarks, w: int, h: int):
+        """Cache a padded pixel box around full-frame landmarks for the next frame's crop."""
+        xs = [lm.x for lm in hand_landmarks.landmark]
+        ys = [lm.y for lm in hand_landmarks.landmark]
+        pad_x = (max(xs) - min(xs)) * ROI_PAD
+        pad_y = (max(ys) - min(ys)) * ROI_PAD
+        x0 = max(0, int((min(xs) - pad_x) * w))
+        y0 = max(0, int((min(ys) - pad_y) * h))
+        x1 = min(w, int((max(xs) + pad_x) * w))
+        y1 = min(h, int((max(ys) + pad_y) * h))
+        self._prev_bbox = (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+        
+    def _load_landmark_model(self):
+        """Load the TFLite hand landmark model with XNNPACK, or None to use mp_hands throughout."""
+        if Interpreter is None or not os.path.isfile(LANDMARK_MODEL):
+            return None
+        try:
+            delegates = [load_delegate(XNNPACK_LIB)]
+        except (ValueError, OSError):
+            delegates = []  # Recent TFLite builds apply XNNPACK to CPU models by default
+        try:
+            net = Interpreter(model_path=LANDMARK_MODEL, experimental_delegates=delegates)
+            net.allocate_tensors()
+        except Exception as e:
+            log.warning("Could not load %s: %s", LANDMARK_MODEL, e)
+            return None
+        self._lm_in = net.get_input_details()[0]['index']
+        # Outputs, in name order: 63 screen landmark coords, presence logit,
+        # handedness, 63 world landmark coords
+        outputs = sorted(net.get_output_details(), key=lambda d: d['name'])
+        self._lm_out = next(d['index'] for d in outputs if d['shape'][-1] == 63)
+        self._lm_score = next(d['index'] for d in outputs if d['shape'][-1] == 1)
+        print(f"Tracking with {LANDMARK_MODEL}")
+        return net
+        
+    def _track_landmarks(self, rgb_frame):
+        """Run the landmark model on a square crop around the cached hand box.
+
+        Returns a results object shaped like mp_hands.process() output, with
+        landmarks already in full-frame coordinates.
+        """
+        h, w = rgb_frame.shape[:2]
+        x0, y0, x1, y1 = self._prev_bbox
+        side = max(x1 - x0, y1 - y0)
+        cx, cy = (x0 + x1) // 2, (y0 + y1) // 2
+        x0, y0 = max(0, cx - side // 2), max(0, cy - side // 2)
+        x1, y1 = min(w, x0 + side), min(h, y0 + side)
+        
+        crop = cv2.resize(rgb_frame[y0:y1, x0:x1], (LANDMARK_INPUT, LANDMARK_INPUT))
+        self._landmark_net.set_tensor(self._lm_in, crop[np.newaxis].astype(np.float32) / 255.0)
+        self._landmark_net.invoke()
+        
+        score = 1.0 / (1.0 + math.exp(-self._landmark_net.get_tensor(self._lm_score).item()))
+        if score < LANDMARK_MIN_SCORE:
+            return SimpleNamespace(multi_hand_landmarks=None)
+            
+        pts = self._landmark_net.get_tensor(self._lm_out).reshape(21, 3)
+        sx, sy = (x1 - x0) / (LANDMARK_INPUT * w), (y1 - y0) / (LANDMARK_INPUT * h)
+        ox, oy = x0 / w, y0 / h
+        hand = landmark_pb2.NormalizedLandmarkList()
+        for px, py, pz in pts.tolist():
+            hand.landmark.add(x=px * sx + ox, y=py * sy + oy, z=pz / LANDMARK_INPUT)
+        return SimpleNamespace(multi_hand_landmarks=[hand])
+        
+    def _detect(self, rgb_frame):
+        """Track the cached hand box if there is one, else search the whole frame with MediaPipe.
+
+        The box is tracked with the TFLite landmark model when it loaded, else
+        with MediaPipe on the crop. Landmarks from a crop are rescaled in place to full-frame coordinates.
+        """
+        h, w = rgb_frame.shape[:2]
+        if self._prev_bbox is None:
+            # Landmarks are normalized, so the smaller image needs no coordinate fix-up
+            results = self.mp_hands.process(cv2.resize(rgb_frame, INFER_SIZE, interpolation=cv2.INTER_AREA))
+        elif self._landmark_net is not None:
+            results = self._track_landmarks(rgb_frame)
+        else:
+            x0, y0, x1, y1 = self._prev_bbox
+            results = self.mp_hands.process(np.ascontiguousarray(rgb_frame[y0:y1, x0:x1]))
+            if results.multi_hand_landmarks:
+                sx, sy = (x1 - x0) / w, (y1 - y0) / h
+                ox, oy = x0 / w, y0 / h
+                for hand_landmarks in results.multi_hand_landmarks:
+                    for lm in hand_landmarks.landmark:
+                        lm.x = lm.x * sx + ox
+                        lm.y = lm.y * sy + oy
+                        
+        if results.multi_hand_landmarks:
+            self._update_roi(results.multi_hand_landmarks[0], w, h)
+        else:
+            self._prev_bbox = None  # Lost the hand; search the full frame next time
+        return results
+        
     def _smooth_cursor(self, target_x: float, target_y: float) -> tuple[int, int]:
         """Smoothly interpolate cursor position."""
-        # Get current cursor position
-        current_x, current_y = pyautogui.position()
-        
-        # Apply exponential moving average smoothing
-        smooth_x, smooth_y = self.position_smoother(target_x, target_y)
-        
-        # Apply Kalman filter for additional smoothing
-        kalman_x, kalman_y = self.kalman_smoother(smooth_x, smooth_y)
+        # One Kalman stage; a separate EMA in front of it only added lag
+        kalman_x, kalman_y = self.kalman_smoother(target_x, target_y)
         
         return int(kalman_x), int(kalman_y)
         
     def _update_drag_filtered(self, target_x: float, target_y: float):
         """Update cursor position with direct movement."""
-        # Add to drag buffer
-        self.drag_buf.append((target_x, target_y))
+        # Add to drag buffer, overwriting the oldest entry once full
+        self._drag_buf[self._drag_idx] = (target_x, target_y)
+        self._drag_idx = (self._drag_idx + 1) % SMOOTH_WINDOW
+        self._drag_len = min(self._drag_len + 1, SMOOTH_WINDOW)
         
         # Calculate average position
-        avg_x = sum(x for x, _ in self.drag_buf) / len(self.drag_buf)
-        avg_y = sum(y for _, y in self.drag_buf) / len(self.drag_buf)
+        avg_x, avg_y = self._drag_buf[:self._drag_len].mean(axis=0)
         
         # Move cursor
-        pyautogui.dragTo(int(avg_x), int(avg_y), duration=0.01, button='left')
-        
-    def _update_bounding_box(self, x: float, y: float):
-        """Update the dynamic bounding box."""
-        # Expand box if hand moves outside
-        if x < self.min_x:
-            self.min_x -= BOX_GROW * (self.min_x - x)
-        if x > self.max_x:
-            self.max_x += BOX_GROW * (x - self.max_x)
-        if y < self.min_y:
-            self.min_y -= BOX_GROW * (self.min_y - y)
-        if y > self.max_y:
-            self.max_y += BOX_GROW * (y - self.max_y)
-            
-        # Slowly shrink box when hand stays inside
-        self.min_x = max(0, self.min_x + BOX_DECAY)
-        self.max_x = min(1, self.max_x - BOX_DECAY)
-        self.min_y = max(0, self.min_y + BOX_DECAY)
-        self.max_y = min(1, self.max_y - BOX_DECAY)
-        
-    def _map_to_screen(self, x: float, y: float) -> tuple[int, int]:
-        """Map hand coordinates to screen coordinates with stretch-band edge for all directions."""
-        # Normalize coordinates to 0-1 range
-        norm_x = float(x)  # No longer inverting X coordinate
-        norm_y = float(y)  # Keep Y as is
-        
-        # Apply stretch-band to all edges
-        # Bottom edge (60-100%) - increased boost area and strength
-        if norm_y > 0.60:
-            extra = (norm_y - 0.60) / 0.40  # 0-1 inside the band
-            norm_y = 0.60 + extra * 0.8  # amplify by +80%
-            
-        # Top edge (0-5%) - weakened boost
-        elif norm_y < 0.05:
-            extra = (0.05 - norm_y) / 0.05  # 0-1 inside the band
-            norm_y = 0.05 - extra * 0.2  # reduced to +20%
-            
-        # Right edge (95-100%) - weakened boost
-        if norm_x > 0.95:
-            extra = (norm_x - 0.95) / 0.05  # 0-1 inside the band
-            norm_x = 0.95 + extra * 0.2  # reduced to +20%
-        # Left edge (0-5%) - weakened boost
-        elif norm_x < 0.05:
-            extra = (0.05 - norm_x) / 0.05  # 0-1 inside the band
-            norm_x = 0.05 - extra * 0.2  # reduced to +20%
-        
-        # Map to screen coordinates
-        screen_x = norm_x * pyautogui.size()[0]
-        screen_y = norm_y * pyautogui.size()[1]
-        
-        # Clamp to screen bounds
-        screen_x = max(0, min(screen_x, pyautogui.size()[0]))
-        screen_y = max(0, min(screen_y, pyautogui.size()[1]))
-        
-        return int(screen_x), int(screen_y)
-        
-    def _distance(self, p1: tuple[float, float], p2: tuple[float, float]) -> float:
-        """Calculate distance between two points."""
-        return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-        
-    def _is_extended(self, tip: tuple[float, float], pip: tuple[float, float]) -> bool:
-        """Check if a finger is extended."""
-        return tip[1] < pip[1]
-        
-    def _is_curled(self, tip: tuple[float, float], pip: tuple[float, float]) -> bool:
-        """Check if a finger is curled."""
-        return tip[1] > pip[1]
-            
+        self._last_set_cursor = (int(avg_x), int(avg_y))
+        self._post('drag', *self._last_set_cursor)
+        
+    @staticmethod
+    def _stretch_x(norm_x):
+        """Stretch-band the left and right edges of normalized x (array-wise)."""
+        # Right edge (95-100%) - weakened boost, reduced to +20%
+        # Left edge (0-5%) - weakened boost, reduced to +20%
+        return np.where(norm_x > 0.95, 0.95 + (norm_x - 0.95) / 0.05 * 0.2,
+               np.where(norm_x < 0.05, 0.05 - (0.05 - norm_x) / 0.05 * 0.2, norm_x))
+        
+    @staticmethod
+    def _stretch_y(norm_y):
+        """Stretch-band the top and bottom edges of normalized y (array-wise)."""
+        # Bottom edge (60-100%) - increased boost area and strength, amplify by +80%
+        # Top edge (0-5%) - weakened boost, reduced to +20%
+        return np.where(norm_y > 0.60, 0.60 + (norm_y - 0.60) / 0.40 * 0.8,
+               np.where(norm_y < 0.05, 0.05 - (0.05 - norm_y) / 0.05 * 0.2, norm_y))
+        
+    def _build_screen_luts(self):
+        """Tabulate the stretch-band mapping to screen pixels for each axis."""
+        sw, sh = self._screen_w, self._screen_h
+        grid = np.linspace(0, 1, MAP_LUT_SIZE)
+        # Kept fractional: process_landmarks interpolates between entries
+        self._x_lut = (self._stretch_x(grid) * sw).clip(0, sw - 1).astype(np.float32)
+        self._y_lut = (self._stretch_y(grid) * sh).clip(0, sh - 1).astype(np.float32)
+        
     def update_frame(self):
         try:
             if not self.is_tracking:
                 return
                 
-            ret, frame = self.cap.read()
-            if not ret:
-                self.status_label.setText("Error reading frame")
-                return
+            frame = self._take_frame()
+            if frame is None:
+                return  # No new frame since the last tick
                 
-            # Flip frame horizontally for display
-            frame = cv2.flip(frame, 1)
+            # Flip frame horizontally for display and convert to RGB once;
+            # MediaPipe, the overlay and Qt all use this one buffer
+            rgb_frame = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
             
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.mp_hands.process(rgb_frame)
+            results = self._detect(rgb_frame)
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
                     # Draw landmarks
                     mp.solutions.drawing_utils.draw_landmarks(
-                        frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+                        rgb_frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
                     
-                    # Get all needed landmark points
-                    thumb_tip = (hand_landmarks.landmark[4].x, hand_landmarks.landmark[4].y)
-                    index_tip = (hand_landmarks.landmark[8].x, hand_landmarks.landmark[8].y)
-                    middle_tip = (hand_landmarks.landmark[12].x, hand_landmarks.landmark[12].y)
-                    ring_tip = (hand_landmarks.landmark[16].x, hand_landmarks.landmark[16].y)
-                    pinky_tip = (hand_landmarks.landmark[20].x, hand_landmarks.landmark[20].y)
+                    # All 21 landmarks as one (21, 2) array
+                    pts = np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
                     
-                    # Get PIP joints for extension check
-                    index_pip = (hand_landmarks.landmark[6].x, hand_landmarks.landmark[6].y)
-                    middle_pip = (hand_landmarks.landmark[10].x, hand_landmarks.landmark[10].y)
-                    ring_pip = (hand_landmarks.landmark[14].x, hand_landmarks.landmark[14].y)
-                    pinky_pip = (hand_landmarks.landmark[18].x, hand_landmarks.landmark[18].y)
-                    thumb_pip = (hand_landmarks.landmark[2].x, hand_landmarks.landmark[2].y)
+                    # Finger mask, pinch, dynamic box and screen mapping in
+                    # one compiled call; pinch drives both drag and click
+                    target_x, target_y, extended, pinch = process_landmarks(
+                        pts, self._box, self._x_lut, self._y_lut)
+                    target_x, target_y = int(target_x), int(target_y)
                     
                     # Get cursor point from middle knuckle
-                    cursor_pt = (hand_landmarks.landmark[14].x, hand_landmarks.landmark[14].y)
-                    
-                    # Update dynamic bounding box
-                    self._update_bounding_box(cursor_pt[0], cursor_pt[1])
-                    
-                    # Map to screen coordinates with dynamic box and non-linear boost
-                    target_x, target_y = self._map_to_screen(*cursor_pt)
+                    cursor_pt = (float(pts[14, 0]), float(pts[14, 1]))
                     
                     # Check for drag gesture first
-                    if self._distance(index_tip, thumb_tip) < PINCH_THRESHOLD:
+                    if pinch:
                         current_time = time.time()
                         if not self.drag_state:
                             if self.pinch_start_time == 0:
                                 self.pinch_start_time = current_time
                                 self.anchor_hand = cursor_pt
-                                self.anchor_cur = pyautogui.position()
+                                self.anchor_cur = self._last_set_cursor
                             elif current_time - self.pinch_start_time >= DRAG_DELAY:
-                                pyautogui.mouseDown()
+                                self._post('down')
                                 self.drag_state = True
                     else:
                         if self.drag_state:
-                            pyautogui.mouseUp()
+                            self._post('up')
                             self.drag_state = False
                         self.pinch_start_time = 0
                     
@@ -356,55 +584,46 @@ class SimpleGUI(QMainWindow):
                     else:
                         # Use normal cursor movement
                         screen_x, screen_y = self._smooth_cursor(target_x, target_y)
-                        pyautogui.moveTo(screen_x, screen_y, _pause=False)
+                        self._last_set_cursor = (screen_x, screen_y)
+                        self._post('move', screen_x, screen_y)
                     
                     # Left click: pointer and thumb touch with tighter threshold
-                    if self._distance(index_tip, thumb_tip) < PINCH_THRESHOLD:
+                    if pinch:
                         if not self.click_state:
-                            pyautogui.click()
+                            self._post('click')
                             self.click_state = True
                     else:
                         self.click_state = False
                     
                     # Enter: only thumb extended
-                    if (self._is_extended(thumb_tip, thumb_pip) and
-                        not self._is_extended(index_tip, index_pip) and
-                        not self._is_extended(middle_tip, middle_pip) and
-                        not self._is_extended(ring_tip, ring_pip) and
-                        not self._is_extended(pinky_tip, pinky_pip)):
+                    if extended == ENTER_MASK:
                         if not self.enter_state:
-                            pyautogui.press('enter')
+                            self._post('press', 'enter')
                             self.enter_state = True
                     else:
                         self.enter_state = False
                     
                     # Dictation: index, middle, and ring fingers curled, others extended
-                    if (self._is_curled(index_tip, index_pip) and
-                        self._is_curled(middle_tip, middle_pip) and
-                        self._is_curled(ring_tip, ring_pip) and
-                        self._is_extended(thumb_tip, thumb_pip) and
-                        self._is_extended(pinky_tip, pinky_pip)):
+                    if extended == DICTATION_MASK:
                         if not self.dictation_state:
-                            # Start dictation in a separate thread to prevent lag
-                            threading.Thread(target=self.dictation.start, daemon=True).start()
+                            # Start dictation on the worker thread to prevent lag
+                            self._dictation_cmd('start')
                             self.dictation_state = True
                     else:
                         if self.dictation_state:
-                            # Stop dictation in a separate thread
-                            threading.Thread(target=self.dictation.stop, daemon=True).start()
+                            # Stop dictation on the worker thread
+                            self._dictation_cmd('stop')
                             self.dictation_state = False
                     
                     # Scroll: pointer and middle extended (down) or pointer+middle+ring (up)
-                    if (self._is_extended(index_tip, index_pip) and
-                        self._is_extended(middle_tip, middle_pip) and
-                        not self._is_extended(pinky_tip, pinky_pip)):
+                    if extended & SCROLL_MASK == SCROLL_BITS:
                         
                         current_time = time.time()
                         if current_time - self.last_scroll_time >= SCROLL_SPEED:
-                            if self._is_extended(ring_tip, ring_pip):  # Scroll up
-                                pyautogui.scroll(SCROLL_AMOUNT)
+                            if extended & SCROLL_UP_BIT:  # Scroll up
+                                self._post('scroll', SCROLL_AMOUNT)
                             else:  # Scroll down
-                                pyautogui.scroll(-SCROLL_AMOUNT)
+                                self._post('scroll', -SCROLL_AMOUNT)
                             self.last_scroll_time = current_time
                         
                         if not self.scroll_state:
@@ -413,74 +632,24 @@ class SimpleGUI(QMainWindow):
                         self.scroll_state = False
                     
                     # Draw stretch-band visualization
-                    h, w = frame.shape[:2]
-                    # Draw band thresholds
-                    band_top = int(0.05 * h)
-                    band_bottom = int(0.60 * h)  # Changed to 60%
-                    band_left = int(0.05 * w)
-                    band_right = int(0.95 * w)
-                    
-                    # Draw horizontal bands
-                    cv2.line(frame, (0, band_top), (w, band_top), (0, 255, 0), 2)
-                    cv2.line(frame, (0, band_bottom), (w, band_bottom), (0, 255, 0), 2)
-                    # Draw vertical bands
-                    cv2.line(frame, (band_left, 0), (band_left, h), (0, 255, 0), 2)
-                    cv2.line(frame, (band_right, 0), (band_right, h), (0, 255, 0), 2)
-                    
-                    # Draw stretch areas
-                    # Bottom stretch (increased area and strength)
-                    for i in range(band_bottom, h, 5):
-                        y_norm = float(i) / h
-                        if y_norm > 0.60:
-                            extra = (y_norm - 0.60) / 0.40
-                            y_stretched = 0.60 + extra * 0.8
-                            x_pos = int(y_stretched * w)
-                            cv2.line(frame, (0, i), (x_pos, i), (0, 0, 255), 1)
-                    
-                    # Top stretch (weakened)
-                    for i in range(0, band_top, 5):
-                        y_norm = float(i) / h
-                        if y_norm < 0.05:
-                            extra = (0.05 - y_norm) / 0.05
-                            y_stretched = 0.05 - extra * 0.2  # reduced to +20%
-                            x_pos = int(y_stretched * w)
-                            cv2.line(frame, (0, i), (x_pos, i), (0, 0, 255), 1)
-                    
-                    # Right stretch (weakened)
-                    for i in range(band_right, w, 5):
-                        x_norm = float(i) / w
-                        if x_norm > 0.95:
-                            extra = (x_norm - 0.95) / 0.05
-                            x_stretched = 0.95 + extra * 0.2  # reduced to +20%
-                            y_pos = int(x_stretched * h)
-                            cv2.line(frame, (i, 0), (i, y_pos), (0, 0, 255), 1)
-                    
-                    # Left stretch (weakened)
-                    for i in range(0, band_left, 5):
-                        x_norm = float(i) / w
-                        if x_norm < 0.05:
-                            extra = (0.05 - x_norm) / 0.05
-                            x_stretched = 0.05 - extra * 0.2  # reduced to +20%
-                            y_pos = int(x_stretched * h)
-                            cv2.line(frame, (i, 0), (i, y_pos), (0, 0, 255), 1)
+                    h, w = rgb_frame.shape[:2]
+                    if (w, h) != self._band_size:
+                        self._build_band_lines(w, h)
+                    cv2.polylines(rgb_frame, self._band_lines, False, (0, 255, 0), 2)
+                    cv2.polylines(rgb_frame, self._stretch_lines, False, (255, 0, 0), 1)  # Red in RGB
                     
                 self.status_label.setText("Hand detected")
             else:
                 self.status_label.setText("No hand detected")
             
-            # Convert to Qt image
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
+            # Wrap the RGB buffer without copying; keep it referenced while Qt uses it
+            self._display_buf = rgb_frame
+            h, w, ch = rgb_frame.shape
             bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
             
-            # Scale and display
-            scaled_pixmap = QPixmap.fromImage(qt_image).scaled(
-                self.display.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.display.setPixmap(scaled_pixmap)
+            # Display; the label scales it
+            self.display.setPixmap(QPixmap.fromImage(qt_image))
             
         except Exception as e:
             print(f"Error in update_frame: {str(e)}")
@@ -488,11 +657,18 @@ class SimpleGUI(QMainWindow):
             
     def closeEvent(self, event):
         """Handle window close event."""
+        self._capturing = False
+        if getattr(self, '_capture_thread', None):
+            self._capture_thread.join(timeout=1.0)
+        if getattr(self, '_action_thread', None):
+            self._post('stop')
         self.cap.release()
         self.mp_hands.close()
         event.accept()
 
 def main():
+    # Per-frame handlers log at DEBUG; raise the level here to see them
+    logging.basicConfig(level=logging.WARNING)
     app = QApplication(sys.argv)
     window = SimpleGUI()
     window.show()
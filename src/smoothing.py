@@ -2,7 +2,6 @@
 from collections import deque
 from typing import Tuple, Deque
 import numpy as np
-from filterpy.kalman import KalmanFilter
 
 class ExpSmoother:
     def __init__(self, alpha=0.65):  # 0.5-0.7 is sweet spot
@@ -39,37 +38,57 @@ class MovingAverageSmoother:
 
     def __init__(self, window: int = 5):
         self.buf: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self.sum_x = self.sum_y = 0.0  # Running sums over buf
 
     def __call__(self, x: float, y: float) -> Tuple[float, float]:
+        if len(self.buf) == self.buf.maxlen:
+            old_x, old_y = self.buf[0]
+            self.sum_x -= old_x
+            self.sum_y -= old_y
         self.buf.append((x, y))
-        avg_x = sum(p[0] for p in self.buf) / len(self.buf)
-        avg_y = sum(p[1] for p in self.buf) / len(self.buf)
-        return avg_x, avg_y
+        self.sum_x += x
+        self.sum_y += y
+        return self.sum_x / len(self.buf), self.sum_y / len(self.buf)
 
 class KalmanSmoother:
-    """2‑D Kalman filter smoother."""
+    """2‑D Kalman filter smoother.
 
-    def __init__(self):
-        self.kf = KalmanFilter(
-            dim_x=4,  # State: [x, y, dx, dy]
-            dim_z=2   # Measurement: [x, y]
-        )
-        self.kf.F = np.array([
-            [1, 0, 1, 0],
-            [0, 1, 0, 1],
-            [0, 0, 0.95, 0],  # Added velocity damping
-            [0, 0, 0, 0.95]   # Added velocity damping
-        ])  # State transition matrix
-        self.kf.H = np.array([
-            [1, 0, 0, 0],
-            [0, 1, 0, 0]
-        ])  # Measurement matrix
-        self.kf.R *= 0.05  # Reduced measurement noise for more smoothing
-        self.kf.Q *= 0.01  # Reduced process noise for more smoothing
-        self.kf.P *= 1000  # Initial covariance
+    Constant-velocity model with state [x, y, dx, dy] and damped velocity.
+    F, Q, R and the initial P don't couple x and y, so the filter splits into
+    two 2-state filters that share one covariance; both are written out as
+    scalar updates.
+    """
+
+    def __init__(self, r: float = 0.05, q: float = 0.01):
+        self.damping = 0.95  # Velocity damping
+        self.r = r           # Measurement noise; higher = smoother
+        self.q = q           # Process noise; lower = smoother
+        self.x = self.y = 0.0
+        self.dx = self.dy = 0.0
+        # Shared per-axis covariance [[p00, p01], [p01, p11]]
+        self.p00 = self.p11 = 1000.0  # Initial covariance
+        self.p01 = 0.0
 
     def __call__(self, x: float, y: float):
         """Update the filter with new measurements."""
-        self.kf.predict()
-        self.kf.update(np.array([x, y]))
-        return self.kf.x[0], self.kf.x[1]  # Return filtered x, y position 
\ No newline at end of file
+        d, q = self.damping, self.q
+
+        # Predict: position moves by velocity, velocity decays
+        x_pred = self.x + self.dx
+        y_pred = self.y + self.dy
+        dx = self.dx * d
+        dy = self.dy * d
+        p00 = self.p00 + 2 * self.p01 + self.p11 + q
+        p01 = d * (self.p01 + self.p11)
+        p11 = d * d * self.p11 + q
+
+        # Update: only position is measured, so the innovation is a scalar
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        rx, ry = x - x_pred, y - y_pred
+        self.x, self.dx = x_pred + k0 * rx, dx + k1 * rx
+        self.y, self.dy = y_pred + k0 * ry, dy + k1 * ry
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return self.x, self.y  # Return filtered x, y position
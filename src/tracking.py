@@ -3,12 +3,29 @@ from __future__ import annotations
 
 import cv2
 import mediapipe as mp
+import numpy as np
+from dataclasses import dataclass
 from typing import Tuple, List
 
 mp_hands = mp.solutions.hands
 
 Pose = List[Tuple[int, int]]  # 21 landmark screen‑pixel integer coords
 
+@dataclass
+class LandmarkFrame:
+    """One hand's 21 normalized landmarks as separate x and y arrays.
+
+    Built from the MediaPipe landmark objects in a single walk, so the
+    gesture code can index plain arrays instead.
+    """
+    xs: np.ndarray  # float32, length 21
+    ys: np.ndarray  # float32, length 21
+
+    @classmethod
+    def from_landmarks(cls, landmarks) -> "LandmarkFrame":
+        xy = np.array([(lm.x, lm.y) for lm in landmarks[:21]], dtype=np.float32).T.copy()
+        return cls(xy[0], xy[1])
+
 class HandTracker:
     def __init__(self, camera: int = 0, max_hands: int = 1, draw: bool = False):
         self.cap = cv2.VideoCapture(camera)